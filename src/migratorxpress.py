@@ -5,19 +5,130 @@ This module provides functionality to build, validate, and execute
 MigratorXpress commands with proper security measures.
 """
 
+import functools
 import os
+import shlex
+import signal
+import stat
 import subprocess
 import logging
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import (
+    IO,
+    Any,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
 from datetime import datetime
 
 from .validators import MigrationParams
-from .version import VersionDetector
+from .version import MigratorXpressVersion, VersionCapabilities, VersionDetector
 
 
 logger = logging.getLogger(__name__)
 
+# Number of trailing output lines kept in memory per stream by execute_command
+_OUTPUT_TAIL_LINES = 1000
+
+# Seconds to wait for the output readers once a timed-out process was killed;
+# a descendant that left its own process group may still hold the pipes open
+_READER_JOIN_TIMEOUT = 5.0
+
+# Execution log write buffer; output lines are flushed in large blocks
+_LOG_BUFFER_SIZE = 1 << 20
+
+# Run the binary in its own session on POSIX so a timeout can kill the whole
+# process group, including helpers such as FastTransfer
+_NEW_SESSION = os.name == "posix"
+
+# Section separator used in execution logs
+_LOG_SEPARATOR = "=" * 80
+
+
+# Flags whose following value is masked in logs and displayed commands
+_SENSITIVE_FLAGS = frozenset({"--license"})
+
+# Argument kinds used by _ARG_SPEC
+_REQUIRED = "required"  # required string value, always emitted as `flag value`
+_VALUE = "value"  # string value, emitted as `flag value` when non-empty
+_NUMBER = "number"  # numeric value, emitted as `flag str(value)` when not None
+_BOOL = "bool"  # optional bool, emitted as `flag true|false` when not None
+_LIST = "list"  # nargs='+' list, emitted as `flag v1 v2 ...` when non-empty
+_FLAG = "flag"  # boolean switch, emitted as `flag` when True
+
+# Declarative mapping of MigrationParams fields to CLI arguments, in emission order
+_ARG_SPEC: Tuple[Tuple[str, str, str], ...] = (
+    # Auth file (required)
+    ("auth_file", "-a", _REQUIRED),
+    # Required database identifiers
+    ("source_db_auth_id", "--source_db_auth_id", _REQUIRED),
+    ("source_db_name", "--source_db_name", _REQUIRED),
+    ("target_db_auth_id", "--target_db_auth_id", _REQUIRED),
+    ("target_db_name", "--target_db_name", _REQUIRED),
+    ("migration_db_auth_id", "--migration_db_auth_id", _REQUIRED),
+    # Schema names
+    ("source_schema_name", "--source_schema_name", _VALUE),
+    ("target_schema_name", "--target_schema_name", _VALUE),
+    # Task list
+    ("task_list", "--task_list", _LIST),
+    # Resume
+    ("resume", "-r", _VALUE),
+    # FastTransfer
+    ("fasttransfer_dir_path", "--fasttransfer_dir_path", _VALUE),
+    ("fasttransfer_p", "-p", _NUMBER),
+    ("ft_large_table_th", "--ft_large_table_th", _NUMBER),
+    # Parallelism
+    ("n_jobs", "--n_jobs", _NUMBER),
+    # Index thresholds
+    ("cci_threshold", "--cci_threshold", _NUMBER),
+    ("aci_threshold", "--aci_threshold", _NUMBER),
+    # Migration DB mode
+    ("migration_db_mode", "--migration_db_mode", _VALUE),
+    # String-boolean parameters
+    ("compute_nbrows", "--compute_nbrows", _BOOL),
+    ("drop_tables_if_exists", "--drop_tables_if_exists", _BOOL),
+    # Load mode
+    ("load_mode", "--load_mode", _VALUE),
+    # Filtering
+    ("include_tables", "-i", _VALUE),
+    ("exclude_tables", "-e", _VALUE),
+    ("min_rows", "-min", _NUMBER),
+    ("max_rows", "-max", _NUMBER),
+    # Oracle-specific lists
+    ("forced_int_id_prefixes", "--forced_int_id_prefixes", _LIST),
+    ("forced_int_id_suffixes", "--forced_int_id_suffixes", _LIST),
+    # Profiling
+    ("profiling_sample_pc", "--profiling_sample_pc", _NUMBER),
+    ("p_query", "--p_query", _NUMBER),
+    ("min_sample_pc_profile", "--min_sample_pc_profile", _NUMBER),
+    # Boolean flags
+    ("force", "-f", _FLAG),
+    ("basic_diff", "--basic_diff", _FLAG),
+    ("without_xid", "--without_xid", _FLAG),
+    # FK mode
+    ("fk_mode", "--fk_mode", _VALUE),
+    # Logging
+    ("log_level", "--log_level", _VALUE),
+    ("log_dir", "--log_dir", _VALUE),
+    # Display flags
+    ("no_banner", "--no_banner", _FLAG),
+    ("no_progress", "--no_progress", _FLAG),
+    ("quiet_ft", "--quiet_ft", _FLAG),
+    # License
+    ("license", "--license", _VALUE),
+    ("license_file", "--license_file", _VALUE),
+)
+
 
 class MigratorXpressError(Exception):
     """Base exception for MigratorXpress operations."""
@@ -28,71 +139,127 @@ class MigratorXpressError(Exception):
 class CommandBuilder:
     """Builds MigratorXpress commands from validated parameters."""
 
-    def __init__(self, binary_path: str):
+    def __init__(
+        self,
+        binary_path: str,
+        *,
+        version_hint: Optional[str] = None,
+        detect_version: bool = True,
+    ):
         """
         Initialize the command builder.
 
         Args:
             binary_path: Path to the MigratorXpress binary
+            version_hint: Known binary version (e.g. '0.6.24'). When given,
+                the binary is not run to detect its version.
+            detect_version: Detect the version now. When False, detection
+                is deferred until the version is first needed.
 
         Raises:
-            MigratorXpressError: If binary doesn't exist or isn't executable
+            MigratorXpressError: If binary doesn't exist or isn't executable,
+                or if version_hint cannot be parsed
         """
         self.binary_path = Path(binary_path)
+        self._binary_path_str = str(self.binary_path)
         self._validate_binary()
-        self._version_detector = VersionDetector(str(self.binary_path))
-        detected = self._version_detector.detect()
-        if detected:
-            logger.info(f"MigratorXpress version {detected} detected")
-        else:
-            logger.warning("Could not detect MigratorXpress version")
+
+        known_version = None
+        if version_hint is not None:
+            try:
+                known_version = MigratorXpressVersion.parse(version_hint)
+            except ValueError as e:
+                raise MigratorXpressError(f"Invalid version hint: {e}") from e
+
+        self._version_detector = VersionDetector(
+            self._binary_path_str, known_version=known_version
+        )
+        self._detected_version: Optional[MigratorXpressVersion] = None
+        self._version_resolved = False
+        self._capabilities_summary: Optional[Mapping[str, Any]] = None
+        if detect_version:
+            self._resolve_version()
 
     @property
     def version_detector(self) -> VersionDetector:
         """Access the version detector instance."""
         return self._version_detector
 
+    def _resolve_version(self) -> Optional[MigratorXpressVersion]:
+        """Run version detection once and cache the result."""
+        if not self._version_resolved:
+            self._detected_version = self._version_detector.detect()
+            self._version_resolved = True
+            if self._detected_version:
+                logger.info(
+                    "MigratorXpress version %s detected", self._detected_version
+                )
+            else:
+                logger.warning("Could not detect MigratorXpress version")
+        return self._detected_version
+
+    def refresh_version(self) -> Optional[MigratorXpressVersion]:
+        """Re-run version detection, e.g. after the binary has been upgraded.
+
+        Returns:
+            The newly detected version, or None if detection failed.
+        """
+        self._version_detector = VersionDetector(self._binary_path_str)
+        self._version_resolved = False
+        self._capabilities_summary = None
+        return self._resolve_version()
+
     def get_version(self) -> Dict[str, Any]:
         """Get version information and capabilities.
 
         Returns:
             Dict with version string, detection status, binary path, and capabilities.
         """
-        detected = self._version_detector.detect()
-        caps = self._version_detector.capabilities
+        detected = self._resolve_version()
 
         return {
             "version": str(detected) if detected else None,
             "detected": detected is not None,
-            "binary_path": str(self.binary_path),
-            "capabilities": {
-                "source_databases": sorted(caps.source_databases),
-                "target_databases": sorted(caps.target_databases),
-                "migration_db_types": sorted(caps.migration_db_types),
-                "tasks": sorted(caps.tasks),
-                "fk_modes": sorted(caps.fk_modes),
-                "migration_db_modes": sorted(caps.migration_db_modes),
-                "load_modes": sorted(caps.load_modes),
-                "supports_no_banner": caps.supports_no_banner,
-                "supports_version_flag": caps.supports_version_flag,
-                "supports_fasttransfer": caps.supports_fasttransfer,
-                "supports_license": caps.supports_license,
-            },
+            "binary_path": self._binary_path_str,
+            "capabilities": self._get_capabilities_summary(),
         }
 
+    def _get_capabilities_summary(self) -> Mapping[str, Any]:
+        """Return the sorted capabilities summary, computed once per detector."""
+        if self._capabilities_summary is None:
+            caps = self._version_detector.capabilities
+            self._capabilities_summary = MappingProxyType(
+                {
+                    "source_databases": tuple(sorted(caps.source_databases)),
+                    "target_databases": tuple(sorted(caps.target_databases)),
+                    "migration_db_types": tuple(sorted(caps.migration_db_types)),
+                    "tasks": tuple(sorted(caps.tasks)),
+                    "fk_modes": tuple(sorted(caps.fk_modes)),
+                    "migration_db_modes": tuple(sorted(caps.migration_db_modes)),
+                    "load_modes": tuple(sorted(caps.load_modes)),
+                    "supports_no_banner": caps.supports_no_banner,
+                    "supports_version_flag": caps.supports_version_flag,
+                    "supports_fasttransfer": caps.supports_fasttransfer,
+                    "supports_license": caps.supports_license,
+                }
+            )
+        return self._capabilities_summary
+
     def _validate_binary(self) -> None:
         """Validate that MigratorXpress binary exists and is executable."""
-        if not self.binary_path.exists():
+        try:
+            st = os.stat(self._binary_path_str)
+        except OSError:
             raise MigratorXpressError(
                 f"MigratorXpress binary not found at: {self.binary_path}"
             )
 
-        if not self.binary_path.is_file():
+        if not stat.S_ISREG(st.st_mode):
             raise MigratorXpressError(
                 f"MigratorXpress path is not a file: {self.binary_path}"
             )
 
-        if not os.access(self.binary_path, os.X_OK):
+        if not os.access(self._binary_path_str, os.X_OK):
             raise MigratorXpressError(
                 f"MigratorXpress binary is not executable: {self.binary_path}"
             )
@@ -108,131 +275,25 @@ class CommandBuilder:
 
         Returns:
             Command as list of strings (suitable for subprocess)
+
+        Raises:
+            MigratorXpressError: If the parameters fail a precheck (e.g.
+                conflicting values or a feature the binary doesn't support)
         """
-        cmd = [str(self.binary_path)]
-
-        # Auth file (required)
-        cmd.extend(["-a", params.auth_file])
-
-        # Required database identifiers
-        cmd.extend(["--source_db_auth_id", params.source_db_auth_id])
-        cmd.extend(["--source_db_name", params.source_db_name])
-        cmd.extend(["--target_db_auth_id", params.target_db_auth_id])
-        cmd.extend(["--target_db_name", params.target_db_name])
-        cmd.extend(["--migration_db_auth_id", params.migration_db_auth_id])
-
-        # Schema names
-        if params.source_schema_name:
-            cmd.extend(["--source_schema_name", params.source_schema_name])
-        if params.target_schema_name:
-            cmd.extend(["--target_schema_name", params.target_schema_name])
-
-        # Task list (nargs='+')
-        if params.task_list:
-            cmd.append("--task_list")
-            cmd.extend(params.task_list)
-
-        # Resume
-        if params.resume:
-            cmd.extend(["-r", params.resume])
-
-        # FastTransfer
-        if params.fasttransfer_dir_path:
-            cmd.extend(["--fasttransfer_dir_path", params.fasttransfer_dir_path])
-        if params.fasttransfer_p is not None:
-            cmd.extend(["-p", str(params.fasttransfer_p)])
-        if params.ft_large_table_th is not None:
-            cmd.extend(["--ft_large_table_th", str(params.ft_large_table_th)])
-
-        # Parallelism
-        if params.n_jobs is not None:
-            cmd.extend(["--n_jobs", str(params.n_jobs)])
-
-        # Index thresholds
-        if params.cci_threshold is not None:
-            cmd.extend(["--cci_threshold", str(params.cci_threshold)])
-        if params.aci_threshold is not None:
-            cmd.extend(["--aci_threshold", str(params.aci_threshold)])
-
-        # Migration DB mode
-        if params.migration_db_mode:
-            cmd.extend(["--migration_db_mode", params.migration_db_mode.value])
-
-        # String-boolean parameters
-        if params.compute_nbrows is not None:
-            cmd.extend(["--compute_nbrows", params.compute_nbrows])
-        if params.drop_tables_if_exists is not None:
-            cmd.extend(["--drop_tables_if_exists", params.drop_tables_if_exists])
-
-        # Load mode
-        if params.load_mode:
-            cmd.extend(["--load_mode", params.load_mode.value])
-
-        # Filtering
-        if params.include_tables:
-            cmd.extend(["-i", params.include_tables])
-        if params.exclude_tables:
-            cmd.extend(["-e", params.exclude_tables])
-        if params.min_rows is not None:
-            cmd.extend(["-min", str(params.min_rows)])
-        if params.max_rows is not None:
-            cmd.extend(["-max", str(params.max_rows)])
-
-        # Oracle-specific lists (nargs='+')
-        if params.forced_int_id_prefixes:
-            cmd.append("--forced_int_id_prefixes")
-            cmd.extend(params.forced_int_id_prefixes)
-        if params.forced_int_id_suffixes:
-            cmd.append("--forced_int_id_suffixes")
-            cmd.extend(params.forced_int_id_suffixes)
-
-        # Profiling
-        if params.profiling_sample_pc is not None:
-            cmd.extend(["--profiling_sample_pc", str(params.profiling_sample_pc)])
-        if params.p_query is not None:
-            cmd.extend(["--p_query", str(params.p_query)])
-        if params.min_sample_pc_profile is not None:
-            cmd.extend(["--min_sample_pc_profile", str(params.min_sample_pc_profile)])
-
-        # Boolean flags
-        if params.force:
-            cmd.append("-f")
-        if params.basic_diff:
-            cmd.append("--basic_diff")
-        if params.without_xid:
-            cmd.append("--without_xid")
-
-        # FK mode
-        if params.fk_mode:
-            cmd.extend(["--fk_mode", params.fk_mode.value])
-
-        # Logging
-        if params.log_level:
-            cmd.extend(["--log_level", params.log_level.value])
-        if params.log_dir:
-            cmd.extend(["--log_dir", params.log_dir])
-
-        # Display flags
-        if params.no_banner:
-            cmd.append("--no_banner")
-        if params.no_progress:
-            cmd.append("--no_progress")
-        if params.quiet_ft:
-            cmd.append("--quiet_ft")
-
-        # License
-        if params.license:
-            cmd.extend(["--license", params.license])
-        if params.license_file:
-            cmd.extend(["--license_file", params.license_file])
-
-        return cmd
+        caps = self._version_detector.capabilities
+        for precheck in _PRECHECKS:
+            error = precheck(params, caps)
+            if error:
+                raise MigratorXpressError(error)
+
+        return [self._binary_path_str, *_iter_args(params)]
 
     def mask_sensitive(self, command: List[str]) -> List[str]:
         """
         Return a copy of the command with sensitive values masked.
 
-        Masks the value following --license with '******'.
+        Masks the value following any flag in _SENSITIVE_FLAGS (currently
+        --license) with '******'.
 
         Args:
             command: Original command list
@@ -241,8 +302,8 @@ class CommandBuilder:
             New list with sensitive values masked
         """
         masked = list(command)
-        for i, token in enumerate(masked):
-            if token == "--license" and i + 1 < len(masked):
+        for i in range(len(masked) - 1):
+            if masked[i] in _SENSITIVE_FLAGS:
                 masked[i + 1] = "******"
         return masked
 
@@ -259,288 +320,551 @@ class CommandBuilder:
         """
         display_cmd = self.mask_sensitive(command) if mask else command
 
-        formatted_parts = [display_cmd[0]]  # Binary path
-
-        i = 1
-        while i < len(display_cmd):
-            if i < len(display_cmd) - 1 and display_cmd[i].startswith("-"):
-                next_item = display_cmd[i + 1]
-                if not next_item.startswith("-"):
-                    param = display_cmd[i]
-                    value = next_item
-                    if " " in value:
-                        formatted_parts.append(f'{param} "{value}"')
-                    else:
-                        formatted_parts.append(f"{param} {value}")
-                    i += 2
+        tokens = iter(display_cmd)
+        formatted_parts = [next(tokens)]  # Binary path
+
+        # Single pass: hold each flag until we see whether a value follows it
+        flag = None
+        for token in tokens:
+            if token.startswith("-"):
+                if flag is not None:
+                    formatted_parts.append(flag)
+                flag = token
+            elif flag is not None:
+                if " " in token:
+                    formatted_parts.append(f'{flag} "{token}"')
                 else:
-                    formatted_parts.append(display_cmd[i])
-                    i += 1
+                    formatted_parts.append(f"{flag} {token}")
+                flag = None
             else:
-                formatted_parts.append(display_cmd[i])
-                i += 1
+                formatted_parts.append(token)
+        if flag is not None:
+            formatted_parts.append(flag)
 
         return " \\\n  ".join(formatted_parts)
 
     def execute_command(
-        self, command: List[str], timeout: int = 3600, log_dir: Optional[Path] = None
+        self,
+        command: List[str],
+        timeout: int = 3600,
+        log_dir: Optional[Path] = None,
+        capture: bool = True,
     ) -> Tuple[int, str, str]:
         """
         Execute a MigratorXpress command.
 
+        Output is streamed line by line into the execution log (when
+        ``log_dir`` is given) while the process runs. Only the last
+        ``_OUTPUT_TAIL_LINES`` lines of each stream are kept in memory and
+        returned to the caller.
+
         Args:
             command: Command to execute
             timeout: Timeout in seconds (default: 3600 = 1 hour)
             log_dir: Directory for execution logs
+            capture: Whether to return output tails. When False, empty strings
+                are returned and, without a log, output goes to /dev/null.
 
         Returns:
-            Tuple of (return_code, stdout, stderr)
+            Tuple of (return_code, stdout_tail, stderr_tail)
 
         Raises:
             MigratorXpressError: If execution fails or times out
         """
         start_time = datetime.now()
+        # The masked string is only needed for the INFO log line and the log file
+        masked_command_str = (
+            shlex.join(self.mask_sensitive(command))
+            if log_dir or logger.isEnabledFor(logging.INFO)
+            else ""
+        )
+
+        logger.info("Executing MigratorXpress command: %s", masked_command_str)
 
-        logger.info(
-            f"Executing MigratorXpress command: {' '.join(self.mask_sensitive(command))}"
+        # Open the log upfront so output can be streamed into it
+        log_file = (
+            self._open_execution_log(log_dir, masked_command_str, start_time)
+            if log_dir
+            else None
         )
 
         try:
-            result = subprocess.run(
-                command, capture_output=True, text=True, timeout=timeout, check=False
+            return_code, stdout, stderr = self._run_streaming(
+                command, timeout, log_file, capture
             )
 
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
 
             logger.info(
-                f"MigratorXpress completed in {duration:.2f}s with return code {result.returncode}"
+                "MigratorXpress completed in %.2fs with return code %s",
+                duration,
+                return_code,
             )
 
-            # Save logs if directory provided
-            if log_dir:
-                self._save_execution_log(
-                    log_dir,
-                    command,
-                    result.returncode,
-                    result.stdout,
-                    result.stderr,
-                    duration,
-                )
+            if log_file is not None:
+                self._finish_execution_log(log_file, return_code, duration)
 
-            return result.returncode, result.stdout, result.stderr
+            return return_code, stdout, stderr
 
         except subprocess.TimeoutExpired as e:
-            logger.error(f"MigratorXpress execution timed out after {timeout}s")
+            logger.error("MigratorXpress execution timed out after %ss", timeout)
+            if log_file is not None:
+                end_time = datetime.now()
+                duration = (end_time - start_time).total_seconds()
+                self._finish_execution_log(log_file, None, duration)
             raise MigratorXpressError(
                 f"Execution timed out after {timeout} seconds"
             ) from e
 
         except Exception as e:
-            logger.error(f"MigratorXpress execution failed: {e}")
+            logger.error("MigratorXpress execution failed: %s", e)
             raise MigratorXpressError(f"Execution failed: {e}") from e
 
-    def _save_execution_log(
+        finally:
+            if log_file is not None:
+                try:
+                    # Flushes the buffered output in one go
+                    log_file.close()
+                except OSError as e:
+                    logger.warning("Failed to save execution log: %s", e)
+
+    def _run_streaming(
         self,
-        log_dir: Path,
         command: List[str],
-        return_code: int,
-        stdout: str,
-        stderr: str,
-        duration: float,
-    ) -> None:
-        """Save execution log to file."""
+        timeout: int,
+        log_file: Optional[BinaryIO],
+        capture: bool = True,
+    ) -> Tuple[int, str, str]:
+        """Run the command, pumping stdout/stderr into the log and bounded tails.
+
+        Pipes are read in binary mode so raw output bytes go straight to the
+        log; only the retained tails are decoded.
+
+        Raises:
+            subprocess.TimeoutExpired: If the process outlives ``timeout``
+                (its process group is killed before re-raising)
+        """
+        if not capture and log_file is None:
+            # Nothing consumes the output: skip pipes and reader threads
+            proc = subprocess.Popen(
+                command,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=_NEW_SESSION,
+            )
+            try:
+                return proc.wait(timeout=timeout), "", ""
+            except subprocess.TimeoutExpired:
+                _kill_process_group(proc)
+                proc.wait()
+                raise
+
+        tail_lines = _OUTPUT_TAIL_LINES if capture else 0
+        stdout_tail: Deque[bytes] = deque(maxlen=tail_lines)
+        stderr_tail: Deque[bytes] = deque(maxlen=tail_lines)
+        log_lock = threading.Lock()
+
+        proc = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=_NEW_SESSION,
+        )
+        readers = [
+            threading.Thread(
+                target=_pump_stream,
+                args=(proc.stdout, stdout_tail, log_file, b"", log_lock),
+                daemon=True,
+            ),
+            threading.Thread(
+                target=_pump_stream,
+                args=(proc.stderr, stderr_tail, log_file, b"[stderr] ", log_lock),
+                daemon=True,
+            ),
+        ]
+        for reader in readers:
+            reader.start()
+
+        join_timeout: Optional[float] = None
+        try:
+            return_code = proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill_process_group(proc)
+            proc.wait()
+            # Don't let a surviving descendant holding the pipes block the
+            # timeout; the daemon reader threads are abandoned instead
+            join_timeout = _READER_JOIN_TIMEOUT
+            raise
+        finally:
+            for reader in readers:
+                reader.join(join_timeout)
+                if reader.is_alive():
+                    logger.warning(
+                        "Output pipe still held open by a child process; "
+                        "no longer reading it"
+                    )
+
+        return (
+            return_code,
+            b"".join(stdout_tail).decode("utf-8", "replace"),
+            b"".join(stderr_tail).decode("utf-8", "replace"),
+        )
+
+    def _open_execution_log(
+        self, log_dir: Path, masked_command_str: str, start_time: datetime
+    ) -> Optional[BinaryIO]:
+        """Create the execution log file and write its header.
+
+        ``masked_command_str`` must already have sensitive values masked
+        (see ``mask_sensitive``). ``start_time`` is used for both the file
+        name and the header timestamp.
+
+        Returns:
+            Buffered binary file handle, flushed when closed,
+            or None if the log could not be created
+        """
         try:
             log_dir.mkdir(parents=True, exist_ok=True)
 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            log_file = log_dir / f"migratorxpress_{timestamp}.log"
+            timestamp = start_time.strftime("%Y%m%d_%H%M%S")
+            log_path = log_dir / f"migratorxpress_{timestamp}.log"
+
+            f = open(log_path, "wb", buffering=_LOG_BUFFER_SIZE)
+            f.write(
+                (
+                    "MigratorXpress Execution Log\n"
+                    f"{_LOG_SEPARATOR}\n\n"
+                    f"Timestamp: {start_time.isoformat()}\n\n"
+                    f"Command:\n{masked_command_str}\n\n"
+                    f"{_LOG_SEPARATOR}\n"
+                    "OUTPUT (stderr lines prefixed with '[stderr] '):\n"
+                ).encode("utf-8")
+            )
 
-            with open(log_file, "w") as f:
-                f.write("MigratorXpress Execution Log\n")
-                f.write(f"{'=' * 80}\n\n")
-                f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-                f.write(f"Duration: {duration:.2f} seconds\n")
-                f.write(f"Return Code: {return_code}\n\n")
-                f.write(f"Command:\n{' '.join(self.mask_sensitive(command))}\n\n")
-                f.write(f"{'=' * 80}\n")
-                f.write(f"STDOUT:\n{stdout}\n\n")
-                f.write(f"{'=' * 80}\n")
-                f.write(f"STDERR:\n{stderr}\n")
+            logger.info("Execution log streaming to: %s", log_path)
+            return f
 
-            logger.info(f"Execution log saved to: {log_file}")
+        except Exception as e:
+            logger.warning("Failed to save execution log: %s", e)
+            return None
+
+    def _finish_execution_log(
+        self, log_file: BinaryIO, return_code: Optional[int], duration: float
+    ) -> None:
+        """Append duration and return code to a streamed execution log.
+
+        A ``return_code`` of None records that the process timed out.
+        """
+        status = "none (timed out)" if return_code is None else return_code
+        try:
+            log_file.write(
+                (
+                    f"\n{_LOG_SEPARATOR}\n"
+                    f"Duration: {duration:.2f} seconds\n"
+                    f"Return Code: {status}\n"
+                ).encode("utf-8")
+            )
 
         except Exception as e:
-            logger.warning(f"Failed to save execution log: {e}")
+            logger.warning("Failed to save execution log: %s", e)
+
+
+def _iter_args(params: MigrationParams) -> Iterator[str]:
+    """Yield the CLI tokens for ``params`` following _ARG_SPEC order."""
+    for attr, flag, kind in _ARG_SPEC:
+        value = getattr(params, attr)
+        if kind == _REQUIRED:
+            yield flag
+            yield value
+        elif kind == _NUMBER:
+            if value is not None:
+                yield flag
+                yield str(value)
+        elif kind == _BOOL:
+            if value is not None:
+                yield flag
+                yield "true" if value else "false"
+        elif not value:
+            continue
+        elif kind == _VALUE:
+            yield flag
+            yield value
+        elif kind == _LIST:
+            yield flag
+            yield from value
+        else:  # _FLAG
+            yield flag
+
+
+def _check_row_bounds(
+    params: MigrationParams, caps: VersionCapabilities
+) -> Optional[str]:
+    """Reject a min_rows filter greater than max_rows."""
+    if (
+        params.min_rows is not None
+        and params.max_rows is not None
+        and params.min_rows > params.max_rows
+    ):
+        return (
+            f"min_rows ({params.min_rows}) cannot be greater than "
+            f"max_rows ({params.max_rows})"
+        )
+    return None
+
+
+def _check_fasttransfer_support(
+    params: MigrationParams, caps: VersionCapabilities
+) -> Optional[str]:
+    """Reject FastTransfer options when the binary doesn't support them."""
+    if caps.supports_fasttransfer:
+        return None
+    if (
+        params.fasttransfer_dir_path
+        or params.fasttransfer_p is not None
+        or params.ft_large_table_th is not None
+        or params.quiet_ft
+    ):
+        return "FastTransfer options are not supported by this MigratorXpress version"
+    return None
+
+
+def _check_license_support(
+    params: MigrationParams, caps: VersionCapabilities
+) -> Optional[str]:
+    """Reject license options when the binary doesn't support them."""
+    if not caps.supports_license and (params.license or params.license_file):
+        return (
+            "--license/--license_file are not supported by this MigratorXpress version"
+        )
+    return None
 
 
-def get_supported_capabilities() -> Dict[str, Any]:
-    """
-    Get supported source databases, target databases, migration database types,
-    tasks, modes, and other capabilities.
+def _check_no_banner_support(
+    params: MigrationParams, caps: VersionCapabilities
+) -> Optional[str]:
+    """Reject --no_banner when the binary doesn't support it."""
+    if not caps.supports_no_banner and params.no_banner:
+        return "--no_banner is not supported by this MigratorXpress version"
+    return None
 
-    Returns:
-        Dictionary with all supported capabilities
-    """
-    return {
-        "Source Databases": [
+
+# Cheap checks run by build_command before any argument is emitted
+_PRECHECKS: Tuple[
+    Callable[[MigrationParams, VersionCapabilities], Optional[str]], ...
+] = (
+    _check_row_bounds,
+    _check_fasttransfer_support,
+    _check_license_support,
+    _check_no_banner_support,
+)
+
+
+def _kill_process_group(proc: subprocess.Popen) -> None:
+    """Kill a process started by _run_streaming along with its descendants."""
+    if _NEW_SESSION:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+            return
+        except ProcessLookupError:
+            pass
+    proc.kill()
+
+
+def _pump_stream(
+    stream: IO[bytes],
+    tail: Deque[bytes],
+    log_file: Optional[BinaryIO],
+    prefix: bytes,
+    log_lock: threading.Lock,
+) -> None:
+    """Copy lines from a process pipe into a bounded tail and the log file."""
+    try:
+        for line in stream:
+            tail.append(line)
+            if log_file is not None:
+                try:
+                    with log_lock:
+                        log_file.write(prefix + line)
+                except Exception as e:
+                    # Keep draining the pipe so the process never blocks on it
+                    logger.warning("Failed to write execution log: %s", e)
+                    log_file = None
+    finally:
+        stream.close()
+
+
+def _example_command(*tasks: str) -> str:
+    """Build the example command line shown for a workflow step."""
+    return (
+        "MigratorXpress -a auth.json "
+        "--source_db_auth_id source_db --source_db_name mydb "
+        "--target_db_auth_id target_db --target_db_name targetdb "
+        "--migration_db_auth_id migration_db "
+        f"--task_list {' '.join(tasks)}"
+    )
+
+
+# Static capabilities payload, built once at import time
+_SUPPORTED_CAPABILITIES: Mapping[str, Any] = MappingProxyType(
+    {
+        "Source Databases": (
             "Oracle (oracle)",
             "PostgreSQL (postgresql)",
             "SQL Server (sqlserver)",
             "Netezza (netezza)",
-        ],
-        "Target Databases": [
+        ),
+        "Target Databases": (
             "PostgreSQL (postgresql)",
             "SQL Server (sqlserver)",
-        ],
-        "Migration Database": [
-            "SQL Server (sqlserver)",
-        ],
-        "Tasks": {
-            "translate": "Translate source schema to target schema DDL",
-            "create": "Create target tables from translated DDL",
-            "transfer": "Transfer data from source to target",
-            "diff": "Compare source and target row counts",
-            "copy_pk": "Copy primary key constraints to target",
-            "copy_ak": "Copy alternate key (unique) constraints to target",
-            "copy_fk": "Copy foreign key constraints to target",
-            "all": "Run all tasks in sequence (translate, create, transfer, diff, copy_pk, copy_ak, copy_fk)",
-        },
-        "Migration DB Modes": {
-            "preserve": "Keep existing migration database data",
-            "truncate": "Clear migration database before run",
-            "drop": "Drop and recreate migration database",
-        },
-        "Load Modes": {
-            "truncate": "Truncate target tables before loading",
-            "append": "Append data to existing target tables",
-        },
-        "FK Modes": {
-            "trusted": "Create foreign keys as trusted constraints",
-            "untrusted": "Create foreign keys as untrusted constraints",
-            "disabled": "Create foreign keys in disabled state",
-        },
+        ),
+        "Migration Database": ("SQL Server (sqlserver)",),
+        "Tasks": MappingProxyType(
+            {
+                "translate": "Translate source schema to target schema DDL",
+                "create": "Create target tables from translated DDL",
+                "transfer": "Transfer data from source to target",
+                "diff": "Compare source and target row counts",
+                "copy_pk": "Copy primary key constraints to target",
+                "copy_ak": "Copy alternate key (unique) constraints to target",
+                "copy_fk": "Copy foreign key constraints to target",
+                "all": "Run all tasks in sequence (translate, create, transfer, diff, copy_pk, copy_ak, copy_fk)",
+            }
+        ),
+        "Migration DB Modes": MappingProxyType(
+            {
+                "preserve": "Keep existing migration database data",
+                "truncate": "Clear migration database before run",
+                "drop": "Drop and recreate migration database",
+            }
+        ),
+        "Load Modes": MappingProxyType(
+            {
+                "truncate": "Truncate target tables before loading",
+                "append": "Append data to existing target tables",
+            }
+        ),
+        "FK Modes": MappingProxyType(
+            {
+                "trusted": "Create foreign keys as trusted constraints",
+                "untrusted": "Create foreign keys as untrusted constraints",
+                "disabled": "Create foreign keys in disabled state",
+            }
+        ),
     }
+)
 
-
-def suggest_workflow(
-    source_type: str,
-    target_type: str,
-    include_constraints: bool = True,
-) -> Dict[str, Any]:
-    """
-    Suggest an ordered workflow of MigratorXpress tasks based on use case.
-
-    Args:
-        source_type: Source database type (e.g., 'oracle', 'postgresql')
-        target_type: Target database type (e.g., 'postgresql', 'sqlserver')
-        include_constraints: Whether to include constraint copy steps
-
-    Returns:
-        Dictionary with ordered workflow steps and example parameters
-    """
-    steps = []
-
-    # Step 1: Translate
-    steps.append(
+# Static workflow steps, built once at import time
+_CORE_WORKFLOW_STEPS: Tuple[Mapping[str, Any], ...] = (
+    MappingProxyType(
         {
             "step": 1,
             "task": "translate",
             "description": "Translate source schema DDL to target-compatible DDL",
-            "example": (
-                "MigratorXpress -a auth.json "
-                "--source_db_auth_id source_db --source_db_name mydb "
-                "--target_db_auth_id target_db --target_db_name targetdb "
-                "--migration_db_auth_id migration_db "
-                "--task_list translate"
-            ),
+            "example": _example_command("translate"),
         }
-    )
-
-    # Step 2: Create
-    steps.append(
+    ),
+    MappingProxyType(
         {
             "step": 2,
             "task": "create",
             "description": "Create target tables from translated DDL",
-            "example": (
-                "MigratorXpress -a auth.json "
-                "--source_db_auth_id source_db --source_db_name mydb "
-                "--target_db_auth_id target_db --target_db_name targetdb "
-                "--migration_db_auth_id migration_db "
-                "--task_list create"
-            ),
+            "example": _example_command("create"),
         }
-    )
-
-    # Step 3: Transfer
-    steps.append(
+    ),
+    MappingProxyType(
         {
             "step": 3,
             "task": "transfer",
             "description": "Transfer data from source to target tables",
-            "example": (
-                "MigratorXpress -a auth.json "
-                "--source_db_auth_id source_db --source_db_name mydb "
-                "--target_db_auth_id target_db --target_db_name targetdb "
-                "--migration_db_auth_id migration_db "
-                "--task_list transfer"
-            ),
+            "example": _example_command("transfer"),
         }
-    )
-
-    # Step 4: Diff
-    steps.append(
+    ),
+    MappingProxyType(
         {
             "step": 4,
             "task": "diff",
             "description": "Compare source and target row counts to verify transfer",
-            "example": (
-                "MigratorXpress -a auth.json "
-                "--source_db_auth_id source_db --source_db_name mydb "
-                "--target_db_auth_id target_db --target_db_name targetdb "
-                "--migration_db_auth_id migration_db "
-                "--task_list diff"
-            ),
+            "example": _example_command("diff"),
         }
-    )
+    ),
+)
+
+_CONSTRAINTS_WORKFLOW_STEP: Mapping[str, Any] = MappingProxyType(
+    {
+        "step": 5,
+        "task": "copy_pk + copy_ak + copy_fk",
+        "description": "Copy primary keys, alternate keys, and foreign keys to target",
+        "example": _example_command("copy_pk", "copy_ak", "copy_fk"),
+    }
+)
+
+_ALL_WORKFLOW_STEP: Mapping[str, Any] = MappingProxyType(
+    {
+        "step": "alt",
+        "task": "all",
+        "description": "Alternative: run all tasks in a single invocation",
+        "example": _example_command("all"),
+    }
+)
 
-    # Step 5: Constraints (optional)
+
+def get_supported_capabilities() -> Mapping[str, Any]:
+    """
+    Get supported source databases, target databases, migration database types,
+    tasks, modes, and other capabilities.
+
+    The returned mapping is a read-only view shared between callers.
+
+    Returns:
+        Mapping with all supported capabilities
+    """
+    return _SUPPORTED_CAPABILITIES
+
+
+def suggest_workflow(
+    source_type: str,
+    target_type: str,
+    include_constraints: bool = True,
+) -> Mapping[str, Any]:
+    """
+    Suggest an ordered workflow of MigratorXpress tasks based on use case.
+
+    Results are memoized per argument triple and returned as read-only
+    mappings shared between callers.
+
+    Args:
+        source_type: Source database type (e.g., 'oracle', 'postgresql')
+        target_type: Target database type (e.g., 'postgresql', 'sqlserver')
+        include_constraints: Whether to include constraint copy steps
+
+    Returns:
+        Mapping with ordered workflow steps and example parameters
+    """
+    return _suggest_workflow_cached(source_type, target_type, include_constraints)
+
+
+@functools.lru_cache(maxsize=64)
+def _suggest_workflow_cached(
+    source_type: str,
+    target_type: str,
+    include_constraints: bool,
+) -> Mapping[str, Any]:
+    """Build the suggest_workflow result for one argument triple."""
+    steps = _CORE_WORKFLOW_STEPS
+
+    # Constraints (optional)
     if include_constraints:
-        steps.append(
-            {
-                "step": 5,
-                "task": "copy_pk + copy_ak + copy_fk",
-                "description": "Copy primary keys, alternate keys, and foreign keys to target",
-                "example": (
-                    "MigratorXpress -a auth.json "
-                    "--source_db_auth_id source_db --source_db_name mydb "
-                    "--target_db_auth_id target_db --target_db_name targetdb "
-                    "--migration_db_auth_id migration_db "
-                    "--task_list copy_pk copy_ak copy_fk"
-                ),
-            }
-        )
+        steps += (_CONSTRAINTS_WORKFLOW_STEP,)
 
     # Alternative: all
-    steps.append(
+    steps += (_ALL_WORKFLOW_STEP,)
+
+    return MappingProxyType(
         {
-            "step": "alt",
-            "task": "all",
-            "description": "Alternative: run all tasks in a single invocation",
-            "example": (
-                "MigratorXpress -a auth.json "
-                "--source_db_auth_id source_db --source_db_name mydb "
-                "--target_db_auth_id target_db --target_db_name targetdb "
-                "--migration_db_auth_id migration_db "
-                "--task_list all"
-            ),
+            "source_type": source_type,
+            "target_type": target_type,
+            "include_constraints": include_constraints,
+            "steps": steps,
         }
     )
-
-    return {
-        "source_type": source_type,
-        "target_type": target_type,
-        "include_constraints": include_constraints,
-        "steps": steps,
-    }
@@ -19,16 +19,33 @@ import os
 import sys
 import logging
 import asyncio
+import functools
+import shlex
+import stat
+import uuid
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict
-
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 try:
+    import jsonschema
     from dotenv import load_dotenv
     from mcp.server import Server
-    from mcp.types import Tool, TextContent
+    from mcp.server.stdio import stdio_server
+    from mcp.types import CallToolResult, Tool, TextContent
     from pydantic import ValidationError
 except ImportError as e:
     print(f"Error: Required package not found: {e}", file=sys.stderr)
@@ -52,13 +69,21 @@ from src.migratorxpress import (
 from src.version import check_version_compatibility
 
 
-# Load environment variables
-load_dotenv()
+# Load environment variables from the project's .env, if there is one; a
+# single stat avoids load_dotenv's upward directory search when it is absent
+_DOTENV_PATH = Path(__file__).parent.parent / ".env"
+if _DOTENV_PATH.is_file():
+    load_dotenv(_DOTENV_PATH)
 
 # Configure logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# getLevelName maps registered level names to their numeric level; anything
+# else (typos, arbitrary strings) falls back to INFO instead of crashing
+_LOG_LEVEL_NO = logging.getLevelName(LOG_LEVEL.upper())
+if not isinstance(_LOG_LEVEL_NO, int):
+    _LOG_LEVEL_NO = logging.INFO
 logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
+    level=_LOG_LEVEL_NO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     handlers=[logging.StreamHandler(sys.stderr)],
 )
@@ -68,335 +93,403 @@ logger = logging.getLogger(__name__)
 MIGRATORXPRESS_PATH = os.getenv("MIGRATORXPRESS_PATH", "./MigratorXpress")
 MIGRATORXPRESS_TIMEOUT = int(os.getenv("MIGRATORXPRESS_TIMEOUT", "3600"))
 MIGRATORXPRESS_LOG_DIR = Path(os.getenv("MIGRATORXPRESS_LOG_DIR", "./logs"))
+MIGRATORXPRESS_VERSION = os.getenv("MIGRATORXPRESS_VERSION") or None
+
+# Most recently previewed commands, keyed by preview ID, so execute_command
+# can run the exact argument list preview_command built
+_MAX_PREVIEWS = 32
+_PREVIEWS: "OrderedDict[str, List[str]]" = OrderedDict()
 
 # Initialize MCP server
 app = Server("migratorxpress")
 
-# Global command builder instance
-try:
-    command_builder = CommandBuilder(MIGRATORXPRESS_PATH)
-    version_info = command_builder.get_version()
+# Global command builder instance. Creating it may run the binary to detect
+# its version, so it is built on first use (or in the background once the
+# server starts) rather than at import time; see _get_builder()
+command_builder: Optional[CommandBuilder] = None
+_builder_initialized = False
+_builder_lock = asyncio.Lock()
+_VERSION_TEXT: Optional[str] = None
+
+# Strong references to fire-and-forget tasks: the event loop only keeps weak
+# ones, so an unreferenced task could be garbage-collected mid-run
+_background_tasks: Set["asyncio.Task[Any]"] = set()
+
+
+def _init_command_builder() -> Optional[CommandBuilder]:
+    """Create the CommandBuilder, or return None if the binary is unusable."""
+    try:
+        builder = CommandBuilder(
+            MIGRATORXPRESS_PATH, version_hint=MIGRATORXPRESS_VERSION
+        )
+    except MigratorXpressError as e:
+        logger.error(f"Failed to initialize CommandBuilder: {e}")
+        return None
+
+    version_info = builder.get_version()
     logger.info(f"MigratorXpress binary found at: {MIGRATORXPRESS_PATH}")
     if version_info["detected"]:
         logger.info(f"MigratorXpress version: {version_info['version']}")
     else:
         logger.warning("MigratorXpress version could not be detected")
-except MigratorXpressError as e:
-    logger.error(f"Failed to initialize CommandBuilder: {e}")
-    command_builder = None
-
-
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """List all available MCP tools."""
-    return [
-        Tool(
-            name="preview_command",
-            description=(
-                "Build and preview a MigratorXpress CLI command WITHOUT executing it. "
-                "This shows the exact command that will be run. "
-                "Use this FIRST before executing any command. "
-                "License text is masked in the display output."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "auth_file": {
-                        "type": "string",
-                        "description": "Path to authentication/credentials JSON file",
-                    },
-                    "source_db_auth_id": {
-                        "type": "string",
-                        "description": "Source database credential ID from the auth file",
-                    },
-                    "source_db_name": {
-                        "type": "string",
-                        "description": "Source database name to migrate from",
-                    },
-                    "target_db_auth_id": {
-                        "type": "string",
-                        "description": "Target database credential ID from the auth file",
-                    },
-                    "target_db_name": {
-                        "type": "string",
-                        "description": "Target database name to migrate to",
-                    },
-                    "migration_db_auth_id": {
-                        "type": "string",
-                        "description": "Migration tracking database credential ID from the auth file",
-                    },
-                    "source_schema_name": {
-                        "type": "string",
-                        "description": "Source schema name. If omitted, all schemas are migrated",
-                    },
-                    "target_schema_name": {
-                        "type": "string",
-                        "description": "Target schema name. Defaults to source schema name if omitted",
-                    },
-                    "task_list": {
-                        "type": "array",
-                        "items": {
-                            "type": "string",
-                            "enum": [t.value for t in TaskType],
-                        },
-                        "description": "Tasks to run (e.g., translate, create, transfer, diff, copy_pk, copy_ak, copy_fk, all)",
-                    },
-                    "resume": {
-                        "type": "string",
-                        "description": "Resume a previous run by RUN_ID",
-                    },
-                    "fasttransfer_dir_path": {
-                        "type": "string",
-                        "description": "Path to FastTransfer binary directory for parallel data transfer",
-                    },
-                    "fasttransfer_p": {
-                        "type": "integer",
-                        "description": "FastTransfer parallel degree (number of threads per table transfer)",
-                    },
-                    "ft_large_table_th": {
-                        "type": "integer",
-                        "description": "Row count threshold above which FastTransfer parallelism is used",
-                    },
-                    "n_jobs": {
-                        "type": "integer",
-                        "description": "Number of concurrent table transfers",
-                    },
-                    "cci_threshold": {
-                        "type": "integer",
-                        "description": "Row count threshold for clustered columnstore index creation on target",
-                    },
-                    "aci_threshold": {
-                        "type": "integer",
-                        "description": "Row count threshold for auto-created indexes on target",
-                    },
-                    "migration_db_mode": {
-                        "type": "string",
-                        "enum": [m.value for m in MigrationDbMode],
-                        "description": "Migration database mode: preserve (keep), truncate (clear data), drop (recreate)",
-                    },
-                    "compute_nbrows": {
-                        "type": "string",
-                        "enum": ["true", "false"],
-                        "description": "Compute row counts for source tables before transfer",
-                    },
-                    "drop_tables_if_exists": {
-                        "type": "string",
-                        "enum": ["true", "false"],
-                        "description": "Drop target tables before creating them",
-                    },
-                    "load_mode": {
-                        "type": "string",
-                        "enum": [m.value for m in LoadMode],
-                        "description": "Data load mode: truncate (clear target first) or append",
-                    },
-                    "include_tables": {
-                        "type": "string",
-                        "description": "Table include patterns, comma-separated. Supports wildcards",
-                    },
-                    "exclude_tables": {
-                        "type": "string",
-                        "description": "Table exclude patterns, comma-separated. Supports wildcards",
-                    },
-                    "min_rows": {
-                        "type": "integer",
-                        "description": "Minimum row count filter — only migrate tables with at least this many rows",
-                    },
-                    "max_rows": {
-                        "type": "integer",
-                        "description": "Maximum row count filter — only migrate tables with at most this many rows",
-                    },
-                    "forced_int_id_prefixes": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Column name prefixes to force integer identity mapping",
-                    },
-                    "forced_int_id_suffixes": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Column name suffixes to force integer identity mapping",
-                    },
-                    "profiling_sample_pc": {
-                        "type": "number",
-                        "description": "Percentage of rows to sample for data profiling (0-100)",
-                    },
-                    "p_query": {
-                        "type": "number",
-                        "description": "Parallelism degree for profiling queries",
-                    },
-                    "min_sample_pc_profile": {
-                        "type": "number",
-                        "description": "Minimum sample percentage for profiling small tables",
-                    },
-                    "force": {
-                        "type": "boolean",
-                        "default": False,
-                        "description": "Force overwrite of existing migration data",
-                    },
-                    "basic_diff": {
-                        "type": "boolean",
-                        "default": False,
-                        "description": "Use basic diff mode (row counts only, no checksum)",
-                    },
-                    "without_xid": {
-                        "type": "boolean",
-                        "default": False,
-                        "description": "Disable transaction ID tracking during transfer",
-                    },
-                    "fk_mode": {
-                        "type": "string",
-                        "enum": [m.value for m in FkMode],
-                        "description": "Foreign key mode: trusted, untrusted, or disabled",
-                    },
-                    "log_level": {
-                        "type": "string",
-                        "enum": [level.value for level in LogLevel],
-                        "description": "Logging verbosity level",
-                    },
-                    "log_dir": {
-                        "type": "string",
-                        "description": "Directory for log files",
-                    },
-                    "no_banner": {
-                        "type": "boolean",
-                        "default": False,
-                        "description": "Suppress the startup banner",
-                    },
-                    "no_progress": {
-                        "type": "boolean",
-                        "default": False,
-                        "description": "Disable progress bar display",
-                    },
-                    "quiet_ft": {
-                        "type": "boolean",
-                        "default": False,
-                        "description": "Suppress FastTransfer console output during data transfer",
-                    },
-                    "license": {
-                        "type": "string",
-                        "description": "License key (will be masked in display)",
-                    },
-                    "license_file": {
+    return builder
+
+
+async def _get_builder() -> Optional[CommandBuilder]:
+    """Return the shared CommandBuilder, creating it on first call.
+
+    Initialization runs in a worker thread so version detection does not
+    block the event loop, and only once even under concurrent calls.
+    """
+    global command_builder, _builder_initialized, _VERSION_TEXT
+    if not _builder_initialized:
+        async with _builder_lock:
+            if not _builder_initialized:
+                command_builder = await asyncio.to_thread(_init_command_builder)
+                if command_builder is not None:
+                    # The binary and its version do not change for the
+                    # lifetime of the process, so render get_version once
+                    _VERSION_TEXT = _render_version_text(command_builder.get_version())
+                _builder_initialized = True
+    return command_builder
+
+
+# Tool definitions are static, so build them once at import time
+_TOOLS: list[Tool] = [
+    Tool(
+        name="preview_command",
+        description=(
+            "Build and preview a MigratorXpress CLI command WITHOUT executing it. "
+            "This shows the exact command that will be run. "
+            "Use this FIRST before executing any command. "
+            "License text is masked in the display output."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "auth_file": {
+                    "type": "string",
+                    "description": "Path to authentication/credentials JSON file",
+                },
+                "source_db_auth_id": {
+                    "type": "string",
+                    "description": "Source database credential ID from the auth file",
+                },
+                "source_db_name": {
+                    "type": "string",
+                    "description": "Source database name to migrate from",
+                },
+                "target_db_auth_id": {
+                    "type": "string",
+                    "description": "Target database credential ID from the auth file",
+                },
+                "target_db_name": {
+                    "type": "string",
+                    "description": "Target database name to migrate to",
+                },
+                "migration_db_auth_id": {
+                    "type": "string",
+                    "description": "Migration tracking database credential ID from the auth file",
+                },
+                "source_schema_name": {
+                    "type": "string",
+                    "description": "Source schema name. If omitted, all schemas are migrated",
+                },
+                "target_schema_name": {
+                    "type": "string",
+                    "description": "Target schema name. Defaults to source schema name if omitted",
+                },
+                "task_list": {
+                    "type": "array",
+                    "items": {
                         "type": "string",
-                        "description": "Path to license key file",
+                        "enum": [t.value for t in TaskType],
                     },
+                    "description": "Tasks to run (e.g., translate, create, transfer, diff, copy_pk, copy_ak, copy_fk, all)",
+                },
+                "resume": {
+                    "type": "string",
+                    "description": "Resume a previous run by RUN_ID",
+                },
+                "fasttransfer_dir_path": {
+                    "type": "string",
+                    "description": "Path to FastTransfer binary directory for parallel data transfer",
+                },
+                "fasttransfer_p": {
+                    "type": "integer",
+                    "description": "FastTransfer parallel degree (number of threads per table transfer)",
+                },
+                "ft_large_table_th": {
+                    "type": "integer",
+                    "description": "Row count threshold above which FastTransfer parallelism is used",
+                },
+                "n_jobs": {
+                    "type": "integer",
+                    "description": "Number of concurrent table transfers",
+                },
+                "cci_threshold": {
+                    "type": "integer",
+                    "description": "Row count threshold for clustered columnstore index creation on target",
+                },
+                "aci_threshold": {
+                    "type": "integer",
+                    "description": "Row count threshold for auto-created indexes on target",
+                },
+                "migration_db_mode": {
+                    "type": "string",
+                    "enum": [m.value for m in MigrationDbMode],
+                    "description": "Migration database mode: preserve (keep), truncate (clear data), drop (recreate)",
+                },
+                "compute_nbrows": {
+                    "type": "string",
+                    "enum": ["true", "false"],
+                    "description": "Compute row counts for source tables before transfer",
+                },
+                "drop_tables_if_exists": {
+                    "type": "string",
+                    "enum": ["true", "false"],
+                    "description": "Drop target tables before creating them",
+                },
+                "load_mode": {
+                    "type": "string",
+                    "enum": [m.value for m in LoadMode],
+                    "description": "Data load mode: truncate (clear target first) or append",
+                },
+                "include_tables": {
+                    "type": "string",
+                    "description": "Table include patterns, comma-separated. Supports wildcards",
+                },
+                "exclude_tables": {
+                    "type": "string",
+                    "description": "Table exclude patterns, comma-separated. Supports wildcards",
+                },
+                "min_rows": {
+                    "type": "integer",
+                    "description": "Minimum row count filter — only migrate tables with at least this many rows",
+                },
+                "max_rows": {
+                    "type": "integer",
+                    "description": "Maximum row count filter — only migrate tables with at most this many rows",
+                },
+                "forced_int_id_prefixes": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Column name prefixes to force integer identity mapping",
+                },
+                "forced_int_id_suffixes": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Column name suffixes to force integer identity mapping",
+                },
+                "profiling_sample_pc": {
+                    "type": "number",
+                    "description": "Percentage of rows to sample for data profiling (0-100)",
+                },
+                "p_query": {
+                    "type": "number",
+                    "description": "Parallelism degree for profiling queries",
+                },
+                "min_sample_pc_profile": {
+                    "type": "number",
+                    "description": "Minimum sample percentage for profiling small tables",
+                },
+                "force": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Force overwrite of existing migration data",
+                },
+                "basic_diff": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Use basic diff mode (row counts only, no checksum)",
+                },
+                "without_xid": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Disable transaction ID tracking during transfer",
+                },
+                "fk_mode": {
+                    "type": "string",
+                    "enum": [m.value for m in FkMode],
+                    "description": "Foreign key mode: trusted, untrusted, or disabled",
+                },
+                "log_level": {
+                    "type": "string",
+                    "enum": [level.value for level in LogLevel],
+                    "description": "Logging verbosity level",
+                },
+                "log_dir": {
+                    "type": "string",
+                    "description": "Directory for log files",
+                },
+                "no_banner": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Suppress the startup banner",
+                },
+                "no_progress": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Disable progress bar display",
+                },
+                "quiet_ft": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Suppress FastTransfer console output during data transfer",
+                },
+                "license": {
+                    "type": "string",
+                    "description": "License key (will be masked in display)",
+                },
+                "license_file": {
+                    "type": "string",
+                    "description": "Path to license key file",
                 },
-                "required": [
-                    "auth_file",
-                    "source_db_auth_id",
-                    "source_db_name",
-                    "target_db_auth_id",
-                    "target_db_name",
-                    "migration_db_auth_id",
-                ],
             },
+            "required": [
+                "auth_file",
+                "source_db_auth_id",
+                "source_db_name",
+                "target_db_auth_id",
+                "target_db_name",
+                "migration_db_auth_id",
+            ],
+        },
+    ),
+    Tool(
+        name="execute_command",
+        description=(
+            "Execute a MigratorXpress command that was previously previewed. "
+            "IMPORTANT: You must set confirmation=true to execute. "
+            "This is a safety mechanism to prevent accidental execution."
         ),
-        Tool(
-            name="execute_command",
-            description=(
-                "Execute a MigratorXpress command that was previously previewed. "
-                "IMPORTANT: You must set confirmation=true to execute. "
-                "This is a safety mechanism to prevent accidental execution."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "command": {
-                        "type": "string",
-                        "description": "The exact command from preview_command (space-separated)",
-                    },
-                    "confirmation": {
-                        "type": "boolean",
-                        "description": "Must be true to execute. This confirms the user has reviewed the command.",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "preview_id": {
+                    "type": "string",
+                    "description": "The preview ID returned by preview_command. Preferred over 'command'; each ID can be executed once.",
+                },
+                "command": {
+                    "type": ["array", "string"],
+                    "items": {"type": "string"},
+                    "description": "The exact command from preview_command, as a list of arguments or a space-separated string. Used when no preview_id is given.",
+                },
+                "confirmation": {
+                    "type": "boolean",
+                    "description": "Must be true to execute. This confirms the user has reviewed the command.",
                 },
-                "required": ["command", "confirmation"],
             },
+            "required": ["confirmation"],
+        },
+    ),
+    Tool(
+        name="validate_auth_file",
+        description=(
+            "Validate that an authentication file exists, is valid JSON, "
+            "and optionally check for specific auth_id entries."
         ),
-        Tool(
-            name="validate_auth_file",
-            description=(
-                "Validate that an authentication file exists, is valid JSON, "
-                "and optionally check for specific auth_id entries."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "file_path": {
-                        "type": "string",
-                        "description": "Path to the authentication JSON file",
-                    },
-                    "required_auth_ids": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Optional list of auth_id values that must be present",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "Path to the authentication JSON file",
+                },
+                "required_auth_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Optional list of auth_id values that must be present",
                 },
-                "required": ["file_path"],
             },
+            "required": ["file_path"],
+        },
+    ),
+    Tool(
+        name="list_capabilities",
+        description=(
+            "List supported source databases, target databases, migration database types, "
+            "tasks, migration DB modes, load modes, and FK modes."
         ),
-        Tool(
-            name="list_capabilities",
-            description=(
-                "List supported source databases, target databases, migration database types, "
-                "tasks, migration DB modes, load modes, and FK modes."
-            ),
-            inputSchema={"type": "object", "properties": {}},
+        inputSchema={"type": "object", "properties": {}},
+    ),
+    Tool(
+        name="suggest_workflow",
+        description=(
+            "Given a source database type, target database type, and optional constraint flag, "
+            "suggest the full sequence of MigratorXpress tasks with example commands."
         ),
-        Tool(
-            name="suggest_workflow",
-            description=(
-                "Given a source database type, target database type, and optional constraint flag, "
-                "suggest the full sequence of MigratorXpress tasks with example commands."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "source_type": {
-                        "type": "string",
-                        "description": "Source database type (e.g., 'oracle', 'postgresql', 'sqlserver', 'netezza')",
-                    },
-                    "target_type": {
-                        "type": "string",
-                        "description": "Target database type (e.g., 'postgresql', 'sqlserver')",
-                    },
-                    "include_constraints": {
-                        "type": "boolean",
-                        "default": True,
-                        "description": "Whether to include constraint copy steps (PK, AK, FK)",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "source_type": {
+                    "type": "string",
+                    "description": "Source database type (e.g., 'oracle', 'postgresql', 'sqlserver', 'netezza')",
+                },
+                "target_type": {
+                    "type": "string",
+                    "description": "Target database type (e.g., 'postgresql', 'sqlserver')",
+                },
+                "include_constraints": {
+                    "type": "boolean",
+                    "default": True,
+                    "description": "Whether to include constraint copy steps (PK, AK, FK)",
                 },
-                "required": ["source_type", "target_type"],
             },
+            "required": ["source_type", "target_type"],
+        },
+    ),
+    Tool(
+        name="get_version",
+        description=(
+            "Get the detected MigratorXpress binary version, capabilities, "
+            "and supported databases, tasks, and modes."
         ),
-        Tool(
-            name="get_version",
-            description=(
-                "Get the detected MigratorXpress binary version, capabilities, "
-                "and supported databases, tasks, and modes."
-            ),
-            inputSchema={"type": "object", "properties": {}},
-        ),
-    ]
+        inputSchema={"type": "object", "properties": {}},
+    ),
+]
+
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """List all available MCP tools."""
+    return _TOOLS
 
 
-@app.call_tool()
-async def call_tool(name: str, arguments: Any) -> list[TextContent]:
+# Argument validators compiled once from the tool input schemas
+_ARGUMENT_VALIDATORS = {
+    tool.name: jsonschema.validators.validator_for(tool.inputSchema)(tool.inputSchema)
+    for tool in _TOOLS
+}
+
+
+# Input validation is done here with the precompiled validators instead of
+# letting the MCP SDK rebuild a validator from the schema on every call
+@app.call_tool(validate_input=False)
+async def call_tool(
+    name: str, arguments: Any
+) -> Union[list[TextContent], CallToolResult]:
     """Handle tool calls."""
+    validator = _ARGUMENT_VALIDATORS.get(name)
+    if validator is not None:
+        try:
+            validator.validate(arguments)
+        except jsonschema.ValidationError as e:
+            # Flagged as a tool error, as the SDK's own validation does
+            return CallToolResult(
+                content=[
+                    TextContent(
+                        type="text", text=f"Input validation error: {e.message}"
+                    )
+                ],
+                isError=True,
+            )
+
     try:
-        if name == "preview_command":
-            return await handle_preview_command(arguments)
-        elif name == "execute_command":
-            return await handle_execute_command(arguments)
-        elif name == "validate_auth_file":
-            return await handle_validate_auth_file(arguments)
-        elif name == "list_capabilities":
-            return await handle_list_capabilities(arguments)
-        elif name == "suggest_workflow":
-            return await handle_suggest_workflow(arguments)
-        elif name == "get_version":
-            return await handle_get_version(arguments)
-        else:
+        handler = _HANDLERS.get(name)
+        if handler is None:
             return [TextContent(type="text", text=f"Error: Unknown tool '{name}'")]
+        return await handler(arguments)
 
     except Exception as e:
         logger.exception(f"Error handling tool '{name}': {e}")
@@ -405,7 +498,8 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
 
 async def handle_preview_command(arguments: Dict[str, Any]) -> list[TextContent]:
     """Handle preview_command tool."""
-    if command_builder is None:
+    builder = await _get_builder()
+    if builder is None:
         return [
             TextContent(
                 type="text",
@@ -419,57 +513,58 @@ async def handle_preview_command(arguments: Dict[str, Any]) -> list[TextContent]
 
     try:
         # Validate and parse parameters
-        params = MigrationParams(**arguments)
+        params = MigrationParams.model_validate(arguments)
 
         # Check version compatibility
+        detector = builder.version_detector
         version_warnings = check_version_compatibility(
-            arguments,
-            command_builder.version_detector.capabilities,
-            command_builder.version_detector._detected_version,
+            arguments, detector.capabilities, detector.detect()
         )
 
         # Build command
-        command = command_builder.build_command(params)
+        command = builder.build_command(params)
 
         # Format for display (with license masking)
-        display_command = command_builder.format_command_display(command, mask=True)
+        display_command = builder.format_command_display(command, mask=True)
 
         # Create explanation
         explanation = _build_command_explanation(params)
 
-        # Build response
-        response = [
-            "# MigratorXpress Command Preview",
-            "",
-            "## What this command will do:",
-            explanation,
-        ]
+        preview_id = uuid.uuid4().hex[:12]
+        _PREVIEWS[preview_id] = command
+        if len(_PREVIEWS) > _MAX_PREVIEWS:
+            _PREVIEWS.popitem(last=False)
 
+        # Build response
+        warnings_section = ""
         if version_warnings:
-            response.append("")
-            response.append("## \u26a0 Version Compatibility Warnings")
-            for warning in version_warnings:
-                response.append(f"- {warning}")
+            warnings_section = "\n\n## \u26a0 Version Compatibility Warnings\n" + (
+                "\n".join(f"- {warning}" for warning in version_warnings)
+            )
 
-        response += [
-            "",
-            "## Command:",
-            "```bash",
-            display_command,
-            "```",
-            "",
-            "## To execute this command:",
-            "1. Review the command carefully",
-            "2. Use the `execute_command` tool with the FULL command",
-            "3. Set `confirmation: true` to proceed",
-            "",
-            "## Full command for execution:",
-            "```",
-            " ".join(command),
-            "```",
-        ]
+        text = (
+            "# MigratorXpress Command Preview\n"
+            "\n"
+            "## What this command will do:\n"
+            f"{explanation}{warnings_section}\n"
+            "\n"
+            "## Command:\n"
+            "```bash\n"
+            f"{display_command}\n"
+            "```\n"
+            "\n"
+            "## To execute this command:\n"
+            "1. Review the command carefully\n"
+            f"2. Use the `execute_command` tool with `preview_id: {preview_id}`\n"
+            "3. Set `confirmation: true` to proceed\n"
+            "\n"
+            "## Full command for execution:\n"
+            "```\n"
+            f"{' '.join(command)}\n"
+            "```"
+        )
 
-        return [TextContent(type="text", text="\n".join(response))]
+        return [TextContent(type="text", text=text)]
 
     except ValidationError as e:
         error_msg = [
@@ -489,7 +584,8 @@ async def handle_preview_command(arguments: Dict[str, Any]) -> list[TextContent]
 
 async def handle_execute_command(arguments: Dict[str, Any]) -> list[TextContent]:
     """Handle execute_command tool."""
-    if command_builder is None:
+    builder = await _get_builder()
+    if builder is None:
         return [
             TextContent(
                 type="text",
@@ -514,29 +610,47 @@ async def handle_execute_command(arguments: Dict[str, Any]) -> list[TextContent]
             )
         ]
 
-    # Get command
-    command_str = arguments.get("command", "")
-    if not command_str:
-        return [
-            TextContent(
-                type="text",
-                text="Error: No command provided. Please provide the command from preview_command.",
-            )
-        ]
-
-    # Parse command string into list
-    import shlex
-
-    try:
-        command = shlex.split(command_str)
-    except ValueError as e:
-        return [TextContent(type="text", text=f"Error parsing command: {str(e)}")]
+    # Get command: prefer the exact argument list cached by preview_command
+    preview_id = arguments.get("preview_id")
+    if preview_id:
+        command = _PREVIEWS.pop(preview_id, None)
+        if command is None:
+            return [
+                TextContent(
+                    type="text",
+                    text=(
+                        f"Error: Unknown or already executed preview_id '{preview_id}'. "
+                        "Please run preview_command again."
+                    ),
+                )
+            ]
+    else:
+        command = arguments.get("command")
+        if not command:
+            return [
+                TextContent(
+                    type="text",
+                    text="Error: No command provided. Please provide the preview_id or command from preview_command.",
+                )
+            ]
+        if isinstance(command, str):
+            try:
+                command = shlex.split(command)
+            except ValueError as e:
+                return [
+                    TextContent(type="text", text=f"Error parsing command: {str(e)}")
+                ]
 
     # Execute
     try:
         logger.info("Starting MigratorXpress execution...")
-        return_code, stdout, stderr = command_builder.execute_command(
-            command, timeout=MIGRATORXPRESS_TIMEOUT, log_dir=MIGRATORXPRESS_LOG_DIR
+        # Migrations can run for hours; run them off the event loop so the
+        # server keeps answering other tool calls in the meantime
+        return_code, stdout, stderr = await asyncio.to_thread(
+            builder.execute_command,
+            command,
+            timeout=MIGRATORXPRESS_TIMEOUT,
+            log_dir=MIGRATORXPRESS_LOG_DIR,
         )
 
         # Format response
@@ -585,17 +699,20 @@ async def handle_validate_auth_file(arguments: Dict[str, Any]) -> list[TextConte
     issues = []
     auth_data = None
 
-    # Check file exists
-    path = Path(file_path)
-    if not path.exists():
+    # Check file exists (a single stat covers both checks)
+    try:
+        st = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
+        st = None
+    if st is None:
         issues.append(f"- File not found: {file_path}")
-    elif not path.is_file():
+    elif not stat.S_ISREG(st.st_mode):
         issues.append(f"- Path is not a file: {file_path}")
     else:
         # Try to parse as JSON
         try:
-            with open(path) as f:
-                auth_data = json.load(f)
+            with open(file_path, "rb") as f:
+                auth_data = json.loads(f.read())
         except json.JSONDecodeError as e:
             issues.append(f"- Invalid JSON: {e}")
         except PermissionError:
@@ -603,18 +720,22 @@ async def handle_validate_auth_file(arguments: Dict[str, Any]) -> list[TextConte
 
     # Check required auth IDs
     if auth_data is not None and required_auth_ids:
+        found_ids = None
         if isinstance(auth_data, dict):
-            for auth_id in required_auth_ids:
-                if auth_id not in auth_data:
-                    issues.append(f"- Missing auth_id: '{auth_id}'")
+            found_ids = auth_data.keys()
         elif isinstance(auth_data, list):
-            found_ids = set()
-            for entry in auth_data:
-                if isinstance(entry, dict) and "id" in entry:
-                    found_ids.add(entry["id"])
-            for auth_id in required_auth_ids:
-                if auth_id not in found_ids:
-                    issues.append(f"- Missing auth_id: '{auth_id}'")
+            found_ids = {
+                entry["id"]
+                for entry in auth_data
+                if isinstance(entry, dict) and "id" in entry
+            }
+        if found_ids is not None and not found_ids >= set(required_auth_ids):
+            # Report in the order the caller listed them
+            issues.extend(
+                f"- Missing auth_id: '{auth_id}'"
+                for auth_id in required_auth_ids
+                if auth_id not in found_ids
+            )
 
     if issues:
         response = [
@@ -648,63 +769,24 @@ async def handle_validate_auth_file(arguments: Dict[str, Any]) -> list[TextConte
 
 async def handle_list_capabilities(arguments: Dict[str, Any]) -> list[TextContent]:
     """Handle list_capabilities tool."""
-    caps = get_supported_capabilities()
+    return [TextContent(type="text", text=_CAPS_TEXT)]
 
-    response = [
-        "# MigratorXpress Capabilities",
-        "",
-    ]
 
-    # Source databases
-    response.append("## Source Databases")
-    response.append("")
-    for db in caps["Source Databases"]:
-        response.append(f"- {db}")
-    response.append("")
-
-    # Target databases
-    response.append("## Target Databases")
-    response.append("")
-    for db in caps["Target Databases"]:
-        response.append(f"- {db}")
-    response.append("")
-
-    # Migration database
-    response.append("## Migration Database")
-    response.append("")
-    for db in caps["Migration Database"]:
-        response.append(f"- {db}")
-    response.append("")
-
-    # Tasks
-    response.append("## Available Tasks")
-    response.append("")
-    for task_name, task_desc in caps["Tasks"].items():
-        response.append(f"- **{task_name}**: {task_desc}")
-    response.append("")
-
-    # Migration DB modes
-    response.append("## Migration DB Modes")
-    response.append("")
-    for mode_name, mode_desc in caps["Migration DB Modes"].items():
-        response.append(f"- **{mode_name}**: {mode_desc}")
-    response.append("")
-
-    # Load modes
-    response.append("## Load Modes")
-    response.append("")
-    for mode_name, mode_desc in caps["Load Modes"].items():
-        response.append(f"- **{mode_name}**: {mode_desc}")
-    response.append("")
-
-    # FK modes
-    response.append("## FK Modes")
-    response.append("")
-    for mode_name, mode_desc in caps["FK Modes"].items():
-        response.append(f"- **{mode_name}**: {mode_desc}")
-    response.append("")
+def _render_capabilities_text() -> str:
+    """Render the static list_capabilities Markdown."""
+    caps = get_supported_capabilities()
 
-    return [TextContent(type="text", text="\n".join(response))]
+    return (
+        "# MigratorXpress Capabilities\n"
+        "\n"
+        f"## Source Databases\n\n{_bullets(caps['Source Databases'])}\n\n"
+        f"## Target Databases\n\n{_bullets(caps['Target Databases'])}\n\n"
+        f"## Migration Database\n\n{_bullets(caps['Migration Database'])}\n\n"
+        f"## Available Tasks\n\n{_described_bullets(caps['Tasks'])}\n\n"
+        f"## Migration DB Modes\n\n{_described_bullets(caps['Migration DB Modes'])}\n\n"
+        f"## Load Modes\n\n{_described_bullets(caps['Load Modes'])}\n\n"
+        f"## FK Modes\n\n{_described_bullets(caps['FK Modes'])}\n"
+    )
 
 
 async def handle_suggest_workflow(arguments: Dict[str, Any]) -> list[TextContent]:
@@ -713,34 +795,45 @@ async def handle_suggest_workflow(arguments: Dict[str, Any]) -> list[TextContent
     target_type = arguments.get("target_type", "")
     include_constraints = arguments.get("include_constraints", True)
 
-    workflow = suggest_workflow(source_type, target_type, include_constraints)
+    text = _render_workflow(source_type, target_type, include_constraints)
 
-    response = [
-        "# MigratorXpress Workflow Suggestion",
-        "",
-        f"**Source**: {workflow['source_type']}",
-        f"**Target**: {workflow['target_type']}",
-        f"**Include Constraints**: {'Yes' if workflow['include_constraints'] else 'No'}",
-        "",
-        "## Steps:",
-        "",
-    ]
+    return [TextContent(type="text", text=text)]
 
-    for step in workflow["steps"]:
-        response.append(f"### Step {step['step']}: {step['task']}")
-        response.append(f"{step['description']}")
-        response.append("")
-        response.append("```bash")
-        response.append(step["example"])
-        response.append("```")
-        response.append("")
 
-    return [TextContent(type="text", text="\n".join(response))]
+@functools.lru_cache(maxsize=128)
+def _render_workflow(
+    source_type: str, target_type: str, include_constraints: bool
+) -> str:
+    """Render the suggest_workflow Markdown for one argument combination."""
+    workflow = suggest_workflow(source_type, target_type, include_constraints)
+
+    steps = "\n".join(
+        f"### Step {step['step']}: {step['task']}\n"
+        f"{step['description']}\n"
+        "\n"
+        "```bash\n"
+        f"{step['example']}\n"
+        "```\n"
+        for step in workflow["steps"]
+    )
+
+    return (
+        "# MigratorXpress Workflow Suggestion\n"
+        "\n"
+        f"**Source**: {workflow['source_type']}\n"
+        f"**Target**: {workflow['target_type']}\n"
+        f"**Include Constraints**: {'Yes' if workflow['include_constraints'] else 'No'}\n"
+        "\n"
+        "## Steps:\n"
+        "\n"
+        f"{steps}"
+    )
 
 
 async def handle_get_version(arguments: Dict[str, Any]) -> list[TextContent]:
     """Handle get_version tool."""
-    if command_builder is None:
+    builder = await _get_builder()
+    if builder is None:
         return [
             TextContent(
                 type="text",
@@ -752,75 +845,91 @@ async def handle_get_version(arguments: Dict[str, Any]) -> list[TextContent]:
             )
         ]
 
-    version_info = command_builder.get_version()
+    return [TextContent(type="text", text=_VERSION_TEXT)]
+
+
+def _render_version_text(version_info: Mapping[str, Any]) -> str:
+    """Render the get_version Markdown for a resolved version info mapping."""
     caps = version_info["capabilities"]
 
-    response = [
-        "# MigratorXpress Version Information",
-        "",
-        f"**Version**: {version_info['version'] or 'Unknown'}",
-        f"**Detected**: {'Yes' if version_info['detected'] else 'No'}",
-        f"**Binary Path**: {version_info['binary_path']}",
-        "",
-        "## Supported Source Databases:",
-        ", ".join(f"`{d}`" for d in caps["source_databases"]),
-        "",
-        "## Supported Target Databases:",
-        ", ".join(f"`{d}`" for d in caps["target_databases"]),
-        "",
-        "## Migration Database Types:",
-        ", ".join(f"`{d}`" for d in caps["migration_db_types"]),
-        "",
-        "## Available Tasks:",
-        ", ".join(f"`{t}`" for t in caps["tasks"]),
-        "",
-        "## FK Modes:",
-        ", ".join(f"`{m}`" for m in caps["fk_modes"]),
-        "",
-        "## Migration DB Modes:",
-        ", ".join(f"`{m}`" for m in caps["migration_db_modes"]),
-        "",
-        "## Load Modes:",
-        ", ".join(f"`{m}`" for m in caps["load_modes"]),
-        "",
-        "## Feature Flags:",
-        f"- No Banner: {'Yes' if caps['supports_no_banner'] else 'No'}",
-        f"- Version Flag: {'Yes' if caps['supports_version_flag'] else 'No'}",
-        f"- FastTransfer: {'Yes' if caps['supports_fasttransfer'] else 'No'}",
-        f"- License: {'Yes' if caps['supports_license'] else 'No'}",
-    ]
+    return (
+        "# MigratorXpress Version Information\n"
+        "\n"
+        f"**Version**: {version_info['version'] or 'Unknown'}\n"
+        f"**Detected**: {'Yes' if version_info['detected'] else 'No'}\n"
+        f"**Binary Path**: {version_info['binary_path']}\n"
+        "\n"
+        f"## Supported Source Databases:\n{_code_list(caps['source_databases'])}\n"
+        "\n"
+        f"## Supported Target Databases:\n{_code_list(caps['target_databases'])}\n"
+        "\n"
+        f"## Migration Database Types:\n{_code_list(caps['migration_db_types'])}\n"
+        "\n"
+        f"## Available Tasks:\n{_code_list(caps['tasks'])}\n"
+        "\n"
+        f"## FK Modes:\n{_code_list(caps['fk_modes'])}\n"
+        "\n"
+        f"## Migration DB Modes:\n{_code_list(caps['migration_db_modes'])}\n"
+        "\n"
+        f"## Load Modes:\n{_code_list(caps['load_modes'])}\n"
+        "\n"
+        "## Feature Flags:\n"
+        f"- No Banner: {'Yes' if caps['supports_no_banner'] else 'No'}\n"
+        f"- Version Flag: {'Yes' if caps['supports_version_flag'] else 'No'}\n"
+        f"- FastTransfer: {'Yes' if caps['supports_fasttransfer'] else 'No'}\n"
+        f"- License: {'Yes' if caps['supports_license'] else 'No'}"
+    )
 
-    return [TextContent(type="text", text="\n".join(response))]
 
+def _bullets(items: Iterable[str]) -> str:
+    """Render items as a Markdown bullet list."""
+    return "\n".join(f"- {item}" for item in items)
 
-def _build_command_explanation(params: MigrationParams) -> str:
-    """Build a human-readable explanation of what the command will do."""
-    parts = []
 
-    parts.append(
-        f"Migrate from source database '{params.source_db_name}' to target database '{params.target_db_name}'"
-    )
+def _described_bullets(descriptions: Mapping[str, str]) -> str:
+    """Render a name -> description mapping as bold-named Markdown bullets."""
+    return "\n".join(f"- **{name}**: {desc}" for name, desc in descriptions.items())
+
+
+def _code_list(items: Iterable[str]) -> str:
+    """Render items as a comma-separated list of inline code spans."""
+    return ", ".join(f"`{item}`" for item in items)
+
+
+# Capabilities are fixed for the process lifetime, so render the response
+# once rather than on every call
+_CAPS_TEXT = _render_capabilities_text()
+
+# Tool name -> handler, used by call_tool for dispatch
+_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[list[TextContent]]]] = {
+    "preview_command": handle_preview_command,
+    "execute_command": handle_execute_command,
+    "validate_auth_file": handle_validate_auth_file,
+    "list_capabilities": handle_list_capabilities,
+    "suggest_workflow": handle_suggest_workflow,
+    "get_version": handle_get_version,
+}
 
-    # Source/target schemas
-    if params.source_schema_name:
-        parts.append(f"Source schema: {params.source_schema_name}")
-    if params.target_schema_name:
-        parts.append(f"Target schema: {params.target_schema_name}")
 
-    # Tasks
+def _explain_tasks(params: MigrationParams) -> str:
+    """Describe the selected tasks, or that defaults apply."""
     if params.task_list:
-        parts.append(f"Tasks: {', '.join(params.task_list)}")
-    else:
-        parts.append("No specific tasks selected (defaults will apply)")
+        return f"Tasks: {', '.join(params.task_list)}"
+    return "No specific tasks selected (defaults will apply)"
+
 
-    # FastTransfer
-    if params.fasttransfer_dir_path:
-        ft_info = f"FastTransfer enabled (path: {params.fasttransfer_dir_path})"
-        if params.fasttransfer_p is not None:
-            ft_info += f", parallelism: {params.fasttransfer_p}"
-        parts.append(ft_info)
+def _explain_fasttransfer(params: MigrationParams) -> Optional[str]:
+    """Describe FastTransfer usage, if a FastTransfer path is set."""
+    if not params.fasttransfer_dir_path:
+        return None
+    ft_info = f"FastTransfer enabled (path: {params.fasttransfer_dir_path})"
+    if params.fasttransfer_p is not None:
+        ft_info += f", parallelism: {params.fasttransfer_p}"
+    return ft_info
 
-    # Table filters
+
+def _explain_filters(params: MigrationParams) -> Optional[str]:
+    """Describe the table filters, if any are set."""
     filters = []
     if params.include_tables:
         filters.append(f"include: {params.include_tables}")
@@ -830,22 +939,78 @@ def _build_command_explanation(params: MigrationParams) -> str:
         filters.append(f"min rows: {params.min_rows}")
     if params.max_rows is not None:
         filters.append(f"max rows: {params.max_rows}")
-    if filters:
-        parts.append(f"Table filters: {', '.join(filters)}")
-
-    # Resume
-    if params.resume:
-        parts.append(f"Resuming previous run: {params.resume}")
+    return f"Table filters: {', '.join(filters)}" if filters else None
+
+
+# Explanation lines in display order: (trigger fields, renderer). A renderer
+# only runs when one of its trigger fields was explicitly provided (None means
+# always), and may still return None, e.g. for a field passed as null.
+_EXPLANATION_RENDERERS: Tuple[
+    Tuple[Optional[FrozenSet[str]], Callable[[MigrationParams], Optional[str]]],
+    ...,
+] = (
+    (
+        frozenset({"source_schema_name"}),
+        lambda p: (
+            f"Source schema: {p.source_schema_name}" if p.source_schema_name else None
+        ),
+    ),
+    (
+        frozenset({"target_schema_name"}),
+        lambda p: (
+            f"Target schema: {p.target_schema_name}" if p.target_schema_name else None
+        ),
+    ),
+    (None, _explain_tasks),
+    (frozenset({"fasttransfer_dir_path"}), _explain_fasttransfer),
+    (
+        frozenset({"include_tables", "exclude_tables", "min_rows", "max_rows"}),
+        _explain_filters,
+    ),
+    (
+        frozenset({"resume"}),
+        lambda p: f"Resuming previous run: {p.resume}" if p.resume else None,
+    ),
+    (
+        frozenset({"force"}),
+        lambda p: (
+            "WARNING: Force flag is set — existing data may be overwritten"
+            if p.force
+            else None
+        ),
+    ),
+    (
+        frozenset({"license"}),
+        lambda p: "License key provided (masked in display)" if p.license else None,
+    ),
+)
 
-    # Force
-    if params.force:
-        parts.append("WARNING: Force flag is set — existing data may be overwritten")
 
-    # License
-    if params.license:
-        parts.append("License key provided (masked in display)")
+def _build_command_explanation(params: MigrationParams) -> str:
+    """Build a human-readable explanation of what the command will do."""
+    provided = params.model_fields_set
 
-    return "\n".join(f"{i+1}. {part}" for i, part in enumerate(parts))
+    # Each part is numbered as it is added
+    parts = [
+        f"1. Migrate from source database '{params.source_db_name}' to target database '{params.target_db_name}'"
+    ]
+    for fields, render in _EXPLANATION_RENDERERS:
+        if fields is not None and fields.isdisjoint(provided):
+            continue
+        line = render(params)
+        if line:
+            parts.append(f"{len(parts) + 1}. {line}")
+
+    return "\n".join(parts)
+
+
+def _on_background_task_done(task: "asyncio.Task[Any]") -> None:
+    """Drop a finished background task and log it if it failed."""
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(
+            "Background task %s failed", task.get_name(), exc_info=task.exception()
+        )
 
 
 async def _run():
@@ -855,7 +1020,10 @@ async def _run():
     logger.info(f"Execution timeout: {MIGRATORXPRESS_TIMEOUT}s")
     logger.info(f"Log directory: {MIGRATORXPRESS_LOG_DIR}")
 
-    from mcp.server.stdio import stdio_server
+    # Detect the binary version while the client handshake is in progress
+    init_task = asyncio.create_task(_get_builder(), name="builder-init")
+    _background_tasks.add(init_task)
+    init_task.add_done_callback(_on_background_task_done)
 
     async with stdio_server() as (read_stream, write_stream):
         await app.run(read_stream, write_stream, app.create_initialization_options())
@@ -6,9 +6,9 @@ all MigratorXpress parameters and ensuring parameter compatibility.
 """
 
 from enum import Enum
-from typing import List, Optional
+from typing import Annotated, Any, List, Literal, Optional
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, model_validator
 
 
 class TaskType(str, Enum):
@@ -73,12 +73,35 @@ class LogLevel(str, Enum):
     CRITICAL = "CRITICAL"
 
 
+# Built once at import; the validator below runs on every preview
+_VALID_TASKS = frozenset(t.value for t in TaskType)
+
+_STRING_BOOLS = {"true": True, "false": False}
+
+
+def _parse_string_bool(value: Any) -> Any:
+    """Map the CLI's 'true'/'false' strings to bools; pass bools through."""
+    if isinstance(value, bool):
+        return value
+    try:
+        return _STRING_BOOLS[value]
+    except (KeyError, TypeError):
+        raise ValueError(f"must be 'true' or 'false', got {value!r}") from None
+
+
+# A boolean given as the strings 'true'/'false' (or a real bool)
+StringBool = Annotated[bool, BeforeValidator(_parse_string_bool)]
+
+
 class MigrationParams(BaseModel):
     """Parameters for a MigratorXpress migration command.
 
     MigratorXpress is a single-command CLI — all flags are at the top level.
     """
 
+    # Built once per tool call and only read afterwards
+    model_config = ConfigDict(frozen=True, revalidate_instances="never")
+
     # Required fields
     auth_file: str = Field(
         ..., description="Path to authentication/credentials JSON file"
@@ -124,20 +147,22 @@ class MigrationParams(BaseModel):
     )
 
     # Migration DB
-    migration_db_mode: Optional[MigrationDbMode] = Field(
+    migration_db_mode: Optional[Literal["preserve", "truncate", "drop"]] = Field(
         None, description="Migration database mode"
     )
 
     # String-boolean parameters
-    compute_nbrows: Optional[str] = Field(
+    compute_nbrows: Optional[StringBool] = Field(
         None, description="Compute number of rows (true/false)"
     )
-    drop_tables_if_exists: Optional[str] = Field(
+    drop_tables_if_exists: Optional[StringBool] = Field(
         None, description="Drop target tables if they exist (true/false)"
     )
 
     # Load
-    load_mode: Optional[LoadMode] = Field(None, description="Data load mode")
+    load_mode: Optional[Literal["truncate", "append"]] = Field(
+        None, description="Data load mode"
+    )
 
     # Filtering
     include_tables: Optional[str] = Field(None, description="Table include pattern")
@@ -172,10 +197,14 @@ class MigrationParams(BaseModel):
     without_xid: bool = Field(False, description="Disable XID tracking")
 
     # FK
-    fk_mode: Optional[FkMode] = Field(None, description="Foreign key constraint mode")
+    fk_mode: Optional[Literal["trusted", "untrusted", "disabled"]] = Field(
+        None, description="Foreign key constraint mode"
+    )
 
     # Logging
-    log_level: Optional[LogLevel] = Field(None, description="Logging verbosity level")
+    log_level: Optional[
+        Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+    ] = Field(None, description="Logging verbosity level")
     log_dir: Optional[str] = Field(None, description="Directory for log files")
 
     # Display
@@ -190,33 +219,22 @@ class MigrationParams(BaseModel):
     license_file: Optional[str] = Field(None, description="Path to license file")
 
     @model_validator(mode="after")
-    def validate_task_list_values(self):
-        """Validate that all task_list values are valid and 'all' is not combined."""
-        if self.task_list is not None:
-            valid_tasks = {t.value for t in TaskType}
+    def validate_params(self):
+        """Validate cross-field constraints in a single pass.
+
+        Checks, in order, that all task_list values are valid and 'all' is
+        not combined, and that license and license_file are mutually
+        exclusive.
+        """
+        if self.task_list:
             for task in self.task_list:
-                if task not in valid_tasks:
+                if task not in _VALID_TASKS:
                     raise ValueError(
-                        f"Invalid task '{task}'. Valid tasks: {sorted(valid_tasks)}"
+                        f"Invalid task '{task}'. Valid tasks: {sorted(_VALID_TASKS)}"
                     )
             if "all" in self.task_list and len(self.task_list) > 1:
                 raise ValueError("Task 'all' cannot be combined with other tasks.")
-        return self
 
-    @model_validator(mode="after")
-    def validate_string_booleans(self):
-        """Validate that string-boolean params are 'true' or 'false'."""
-        for field_name in ("compute_nbrows", "drop_tables_if_exists"):
-            value = getattr(self, field_name)
-            if value is not None and value not in ("true", "false"):
-                raise ValueError(
-                    f"'{field_name}' must be 'true' or 'false', got '{value}'"
-                )
-        return self
-
-    @model_validator(mode="after")
-    def validate_license_mutual_exclusivity(self):
-        """Validate that license and license_file are mutually exclusive."""
         if self.license is not None and self.license_file is not None:
             raise ValueError(
                 "license and license_file are mutually exclusive. "
@@ -6,21 +6,27 @@ to known capabilities (supported source databases, target databases, migration
 database types, tasks, modes, and feature flags).
 """
 
+import bisect
 import logging
 import re
 import subprocess
 from dataclasses import dataclass
-from functools import total_ordering
-from typing import Dict, FrozenSet, Optional
+from typing import Dict, FrozenSet, NamedTuple, Optional, Tuple
 
 
 logger = logging.getLogger(__name__)
 
+# Version patterns, compiled once: a bare X.Y.Z anywhere in a string, and the
+# "migratorxpress X.Y.Z" banner printed by ``--version``
+_VERSION_RE = re.compile(r"(\d+)\.(\d+)\.(\d+)")
+_BINARY_VERSION_RE = re.compile(r"migratorxpress\s+(\d+)\.(\d+)\.(\d+)", re.IGNORECASE)
 
-@total_ordering
-@dataclass(frozen=True)
-class MigratorXpressVersion:
-    """Represents a MigratorXpress version number (X.Y.Z)."""
+
+class MigratorXpressVersion(NamedTuple):
+    """Represents a MigratorXpress version number (X.Y.Z).
+
+    Being a tuple, versions compare and hash as (major, minor, patch).
+    """
 
     major: int
     minor: int
@@ -39,7 +45,7 @@ class MigratorXpressVersion:
         Raises:
             ValueError: If the string cannot be parsed
         """
-        match = re.search(r"(\d+)\.(\d+)\.(\d+)", version_string.strip())
+        match = _VERSION_RE.search(version_string.strip())
         if not match:
             raise ValueError(f"Cannot parse version from: {version_string!r}")
         return cls(
@@ -51,20 +57,6 @@ class MigratorXpressVersion:
     def __str__(self) -> str:
         return f"{self.major}.{self.minor}.{self.patch}"
 
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, MigratorXpressVersion):
-            return NotImplemented
-        return self._tuple == other._tuple
-
-    def __lt__(self, other: object) -> bool:
-        if not isinstance(other, MigratorXpressVersion):
-            return NotImplemented
-        return self._tuple < other._tuple
-
-    @property
-    def _tuple(self) -> tuple:
-        return (self.major, self.minor, self.patch)
-
 
 @dataclass(frozen=True)
 class VersionCapabilities:
@@ -83,81 +75,92 @@ class VersionCapabilities:
     supports_license: bool = False
 
 
-# Static version registry: version string -> capabilities
-VERSION_REGISTRY: Dict[str, VersionCapabilities] = {
-    "0.6.24": VersionCapabilities(
-        source_databases=frozenset(
-            [
-                "oracle",
-                "postgresql",
-                "sqlserver",
-                "netezza",
-            ]
-        ),
-        target_databases=frozenset(
-            [
-                "postgresql",
-                "sqlserver",
-            ]
-        ),
-        migration_db_types=frozenset(
-            [
-                "sqlserver",
-            ]
-        ),
-        tasks=frozenset(
-            [
-                "translate",
-                "create",
-                "transfer",
-                "diff",
-                "copy_pk",
-                "copy_ak",
-                "copy_fk",
-                "all",
-            ]
-        ),
-        fk_modes=frozenset(
-            [
-                "trusted",
-                "untrusted",
-                "disabled",
-            ]
-        ),
-        migration_db_modes=frozenset(
-            [
-                "preserve",
-                "truncate",
-                "drop",
-            ]
-        ),
-        load_modes=frozenset(
-            [
-                "truncate",
-                "append",
-            ]
+# Capability sets introduced in the 0.6 line. Later registry entries reuse
+# whichever of these are unchanged rather than building equal copies.
+_SOURCE_DBS_V0_6 = frozenset(("oracle", "postgresql", "sqlserver", "netezza"))
+_TARGET_DBS_V0_6 = frozenset(("postgresql", "sqlserver"))
+_MIGRATION_DB_TYPES_V0_6 = frozenset(("sqlserver",))
+_TASKS_V0_6 = frozenset(
+    (
+        "translate",
+        "create",
+        "transfer",
+        "diff",
+        "copy_pk",
+        "copy_ak",
+        "copy_fk",
+        "all",
+    )
+)
+_FK_MODES_V0_6 = frozenset(("trusted", "untrusted", "disabled"))
+_MIGRATION_DB_MODES_V0_6 = frozenset(("preserve", "truncate", "drop"))
+_LOAD_MODES_V0_6 = frozenset(("truncate", "append"))
+
+# Static version registry of (version, capabilities), kept in ascending
+# version order so lookups can bisect it directly
+_REGISTRY: Tuple[Tuple[MigratorXpressVersion, VersionCapabilities], ...] = (
+    (
+        MigratorXpressVersion(0, 6, 24),
+        VersionCapabilities(
+            source_databases=_SOURCE_DBS_V0_6,
+            target_databases=_TARGET_DBS_V0_6,
+            migration_db_types=_MIGRATION_DB_TYPES_V0_6,
+            tasks=_TASKS_V0_6,
+            fk_modes=_FK_MODES_V0_6,
+            migration_db_modes=_MIGRATION_DB_MODES_V0_6,
+            load_modes=_LOAD_MODES_V0_6,
+            supports_no_banner=True,
+            supports_version_flag=True,
+            supports_fasttransfer=True,
+            supports_license=True,
         ),
-        supports_no_banner=True,
-        supports_version_flag=True,
-        supports_fasttransfer=True,
-        supports_license=True,
     ),
+)
+
+# Version string -> capabilities view of the registry
+VERSION_REGISTRY: Dict[str, VersionCapabilities] = {
+    str(ver): caps for ver, caps in _REGISTRY
 }
 
-# Pre-sorted list of known versions for lookup
-_SORTED_VERSIONS = sorted(
-    [(MigratorXpressVersion.parse(k), v) for k, v in VERSION_REGISTRY.items()],
-    key=lambda x: x[0],
+# Versions alone, in registry order, for bisecting
+_REGISTRY_VERSIONS = tuple(ver for ver, _ in _REGISTRY)
+
+# Capabilities of the newest known version, used whenever the detected
+# version has no registry entry (empty capabilities if the registry is empty)
+LATEST_CAPABILITIES: VersionCapabilities = (
+    _REGISTRY[-1][1]
+    if _REGISTRY
+    else VersionCapabilities(
+        source_databases=frozenset(),
+        target_databases=frozenset(),
+        migration_db_types=frozenset(),
+        tasks=frozenset(),
+        fk_modes=frozenset(),
+        migration_db_modes=frozenset(),
+        load_modes=frozenset(),
+    )
 )
 
 
 class VersionDetector:
     """Detects MigratorXpress binary version and resolves capabilities."""
 
-    def __init__(self, binary_path: str):
+    def __init__(
+        self,
+        binary_path: str,
+        known_version: Optional[MigratorXpressVersion] = None,
+    ):
+        """Create a detector for ``binary_path``.
+
+        Args:
+            binary_path: Path to the MigratorXpress binary
+            known_version: Version already known to the caller; when given,
+                ``detect`` returns it without running the binary
+        """
         self._binary_path = binary_path
-        self._detected_version: Optional[MigratorXpressVersion] = None
-        self._detection_done = False
+        self._detected_version: Optional[MigratorXpressVersion] = known_version
+        self._detection_done = known_version is not None
+        self._capabilities: Optional[VersionCapabilities] = None
 
     def detect(self, timeout: int = 10) -> Optional[MigratorXpressVersion]:
         """Detect the MigratorXpress version by running the binary.
@@ -177,17 +180,18 @@ class VersionDetector:
         self._detection_done = True
 
         try:
+            # Output goes to both streams, so capture both; stdin is the
+            # server's protocol stream and must not be inherited
             result = subprocess.run(
                 [self._binary_path, "--version", "--no_banner"],
+                stdin=subprocess.DEVNULL,
                 capture_output=True,
                 text=True,
                 timeout=timeout,
                 check=False,
             )
             output = (result.stdout + result.stderr).strip()
-            match = re.search(
-                r"migratorxpress\s+(\d+)\.(\d+)\.(\d+)", output, re.IGNORECASE
-            )
+            match = _BINARY_VERSION_RE.search(output)
             if match:
                 self._detected_version = MigratorXpressVersion(
                     major=int(match.group(1)),
@@ -215,36 +219,26 @@ class VersionDetector:
         If the detected version matches a registry entry exactly, return that.
         If the version is newer than all known entries, return the latest known.
         If detection failed, return the latest known entry as a fallback.
+        The result is resolved once per detector.
         """
+        if self._capabilities is None:
+            self._capabilities = self._resolve_capabilities()
+        return self._capabilities
+
+    def _resolve_capabilities(self) -> VersionCapabilities:
+        """Look up the registry entry for the detected version."""
         if not self._detection_done:
             self.detect()
 
-        if not _SORTED_VERSIONS:
-            # No registry entries at all — return empty capabilities
-            return VersionCapabilities(
-                source_databases=frozenset(),
-                target_databases=frozenset(),
-                migration_db_types=frozenset(),
-                tasks=frozenset(),
-                fk_modes=frozenset(),
-                migration_db_modes=frozenset(),
-                load_modes=frozenset(),
-            )
-
         if self._detected_version is None:
             # Detection failed — fall back to latest known
-            return _SORTED_VERSIONS[-1][1]
+            return LATEST_CAPABILITIES
 
         # Find the highest registry entry <= detected version
-        best: Optional[VersionCapabilities] = None
-        for ver, caps in _SORTED_VERSIONS:
-            if ver <= self._detected_version:
-                best = caps
-            else:
-                break
+        idx = bisect.bisect_right(_REGISTRY_VERSIONS, self._detected_version) - 1
 
         # If detected version is older than all known, fall back to latest
-        return best if best is not None else _SORTED_VERSIONS[-1][1]
+        return _REGISTRY[idx][1] if idx >= 0 else LATEST_CAPABILITIES
 
 
 def check_version_compatibility(
@@ -1,8 +1,16 @@
 """Tests for MigratorXpress command builder."""
 
+from collections.abc import Mapping
+from dataclasses import replace
+import io
+import os
 from pathlib import Path
+import shutil
+import signal
+from types import MappingProxyType
 from unittest.mock import Mock, patch
 import subprocess
+import time
 
 import pytest
 
@@ -13,62 +21,86 @@ from src.migratorxpress import (
     suggest_workflow,
 )
 from src.validators import MigrationParams
-from src.version import MigratorXpressVersion
+from src.version import MigratorXpressVersion, VersionCapabilities
 
 
-@pytest.fixture
-def mock_binary(tmp_path):
-    """Create a mock MigratorXpress binary."""
-    binary = tmp_path / "MigratorXpress"
+@pytest.fixture(scope="session")
+def mock_binary(tmp_path_factory):
+    """Create a mock MigratorXpress binary (shared; never modified by tests)."""
+    binary = tmp_path_factory.mktemp("bin") / "MigratorXpress"
     binary.write_text("#!/bin/bash\necho 'mock binary'")
     binary.chmod(0o755)
     return str(binary)
 
 
-@pytest.fixture
-def command_builder(mock_binary):
-    """Create a CommandBuilder with mock binary."""
+# Capabilities of MigratorXpress 0.6.24, shared by every test builder
+_CAPABILITIES = VersionCapabilities(
+    source_databases=frozenset(["oracle", "postgresql", "sqlserver", "netezza"]),
+    target_databases=frozenset(["postgresql", "sqlserver"]),
+    migration_db_types=frozenset(["sqlserver"]),
+    tasks=frozenset(
+        [
+            "translate",
+            "create",
+            "transfer",
+            "diff",
+            "copy_pk",
+            "copy_ak",
+            "copy_fk",
+            "all",
+        ]
+    ),
+    fk_modes=frozenset(["trusted", "untrusted", "disabled"]),
+    migration_db_modes=frozenset(["preserve", "truncate", "drop"]),
+    load_modes=frozenset(["truncate", "append"]),
+    supports_no_banner=True,
+    supports_version_flag=True,
+    supports_fasttransfer=True,
+    supports_license=True,
+)
+
+
+def _make_command_builder(binary):
+    """Create a CommandBuilder for ``binary`` with a mocked 0.6.24 detector."""
     with patch("src.migratorxpress.VersionDetector") as MockDetector:
         mock_detector = MockDetector.return_value
         mock_detector.detect.return_value = MigratorXpressVersion(0, 6, 24)
-        mock_detector.capabilities = Mock()
-        mock_detector.capabilities.source_databases = frozenset(
-            ["oracle", "postgresql", "sqlserver", "netezza"]
-        )
-        mock_detector.capabilities.target_databases = frozenset(
-            ["postgresql", "sqlserver"]
-        )
-        mock_detector.capabilities.migration_db_types = frozenset(["sqlserver"])
-        mock_detector.capabilities.tasks = frozenset(
-            [
-                "translate",
-                "create",
-                "transfer",
-                "diff",
-                "copy_pk",
-                "copy_ak",
-                "copy_fk",
-                "all",
-            ]
-        )
-        mock_detector.capabilities.fk_modes = frozenset(
-            ["trusted", "untrusted", "disabled"]
-        )
-        mock_detector.capabilities.migration_db_modes = frozenset(
-            ["preserve", "truncate", "drop"]
-        )
-        mock_detector.capabilities.load_modes = frozenset(["truncate", "append"])
-        mock_detector.capabilities.supports_no_banner = True
-        mock_detector.capabilities.supports_version_flag = True
-        mock_detector.capabilities.supports_fasttransfer = True
-        mock_detector.capabilities.supports_license = True
-        builder = CommandBuilder(mock_binary)
+        mock_detector.capabilities = _CAPABILITIES
+        builder = CommandBuilder(binary)
     return builder
 
 
-def _minimal_params(**overrides):
-    """Helper to create minimal valid params."""
-    base = {
+@pytest.fixture(scope="session")
+def command_builder(mock_binary):
+    """Shared CommandBuilder with mock binary, for tests that only read it."""
+    return _make_command_builder(mock_binary)
+
+
+@pytest.fixture
+def mutable_command_builder(mock_binary):
+    """Fresh CommandBuilder for tests that change its detector or version."""
+    return _make_command_builder(mock_binary)
+
+
+@pytest.fixture
+def mock_popen():
+    """Patch subprocess.Popen for one test and yield the mock."""
+    with patch("subprocess.Popen") as popen:
+        yield popen
+
+
+def _mock_process(returncode, stdout="", stderr=""):
+    """Create a mock Popen process with the given exit code and output."""
+    process = Mock()
+    process.stdout = io.BytesIO(stdout.encode())
+    process.stderr = io.BytesIO(stderr.encode())
+    process.wait.return_value = returncode
+    return process
+
+
+# The six required params, shared read-only by every test
+_MINIMAL_BASE = MappingProxyType(
+    {
         "auth_file": "auth.json",
         "source_db_auth_id": "source_db",
         "source_db_name": "mydb",
@@ -76,8 +108,17 @@ def _minimal_params(**overrides):
         "target_db_name": "targetdb",
         "migration_db_auth_id": "migration_db",
     }
-    base.update(overrides)
-    return base
+)
+
+
+def _minimal_params(**overrides):
+    """Helper to create minimal valid params."""
+    return {**_MINIMAL_BASE, **overrides}
+
+
+def _flag_positions(command):
+    """Map each flag token in ``command`` to its index, in one pass."""
+    return {tok: i for i, tok in enumerate(command) if tok.startswith("-")}
 
 
 class TestCommandBuilder:
@@ -89,11 +130,40 @@ class TestCommandBuilder:
             builder = CommandBuilder(mock_binary)
         assert builder.binary_path == Path(mock_binary)
 
+    @patch("src.version.subprocess.run")
+    def test_init_with_version_hint_skips_detection(self, mock_run, mock_binary):
+        """Test a version hint is used without running the binary."""
+        builder = CommandBuilder(mock_binary, version_hint="0.6.24")
+
+        assert builder.get_version()["version"] == "0.6.24"
+        mock_run.assert_not_called()
+
+    def test_init_with_invalid_version_hint(self, mock_binary):
+        """Test an unparseable version hint fails."""
+        with pytest.raises(MigratorXpressError, match=r"version hint"):
+            CommandBuilder(mock_binary, version_hint="latest")
+
+    def test_init_with_deferred_detection(self, mock_binary):
+        """Test detect_version=False defers detection to get_version."""
+        with patch("src.migratorxpress.VersionDetector") as MockDetector:
+            MockDetector.return_value.detect.return_value = MigratorXpressVersion(
+                0, 6, 24
+            )
+            builder = CommandBuilder(mock_binary, detect_version=False)
+            MockDetector.return_value.detect.assert_not_called()
+
+            assert builder.get_version()["version"] == "0.6.24"
+            MockDetector.return_value.detect.assert_called_once()
+
     def test_init_with_nonexistent_binary(self):
         """Test initialization with nonexistent binary fails."""
-        with pytest.raises(MigratorXpressError) as exc_info:
+        with pytest.raises(MigratorXpressError, match=r"not found"):
             CommandBuilder("/nonexistent/path/MigratorXpress")
-        assert "not found" in str(exc_info.value)
+
+    def test_init_with_directory(self, tmp_path):
+        """Test initialization with a directory path fails."""
+        with pytest.raises(MigratorXpressError, match=r"not a file"):
+            CommandBuilder(str(tmp_path))
 
     def test_init_with_non_executable_binary(self, tmp_path):
         """Test initialization with non-executable binary fails."""
@@ -101,9 +171,8 @@ class TestCommandBuilder:
         binary.write_text("not executable")
         binary.chmod(0o644)
 
-        with pytest.raises(MigratorXpressError) as exc_info:
+        with pytest.raises(MigratorXpressError, match=r"not executable"):
             CommandBuilder(str(binary))
-        assert "not executable" in str(exc_info.value)
 
     def test_build_command_minimal(self, command_builder):
         """Test building command with minimal (6 required) params only."""
@@ -120,6 +189,25 @@ class TestCommandBuilder:
         assert "--target_db_name" in command
         assert "--migration_db_auth_id" in command
 
+    @pytest.mark.parametrize(
+        "param,flag",
+        [
+            ("auth_file", "-a"),
+            ("source_db_auth_id", "--source_db_auth_id"),
+            ("source_db_name", "--source_db_name"),
+            ("target_db_auth_id", "--target_db_auth_id"),
+            ("target_db_name", "--target_db_name"),
+            ("migration_db_auth_id", "--migration_db_auth_id"),
+        ],
+    )
+    def test_required_flag_emitted_when_empty(self, command_builder, param, flag):
+        """Test required flags are always emitted, even with an empty value."""
+        params = MigrationParams(**_minimal_params(**{param: ""}))
+        command = command_builder.build_command(params)
+
+        idx = command.index(flag)
+        assert command[idx + 1] == ""
+
     def test_no_subcommand_token(self, command_builder):
         """Test that command has no subcommand — command[1] should be '-a'."""
         params = MigrationParams(**_minimal_params())
@@ -171,38 +259,26 @@ class TestCommandBuilder:
         idx = command.index("-r")
         assert command[idx + 1] == "run-123"
 
-    def test_string_boolean_params(self, command_builder):
-        """Test string-boolean params: --compute_nbrows true."""
-        params = MigrationParams(
-            **_minimal_params(compute_nbrows="true", drop_tables_if_exists="false")
-        )
+    @pytest.mark.parametrize(
+        "param,value,tokens",
+        [
+            ("force", True, ["-f"]),
+            ("basic_diff", True, ["--basic_diff"]),
+            ("without_xid", True, ["--without_xid"]),
+            ("no_banner", True, ["--no_banner"]),
+            ("no_progress", True, ["--no_progress"]),
+            ("quiet_ft", True, ["--quiet_ft"]),
+            ("compute_nbrows", "true", ["--compute_nbrows", "true"]),
+            ("drop_tables_if_exists", "false", ["--drop_tables_if_exists", "false"]),
+        ],
+    )
+    def test_boolean_flag(self, command_builder, param, value, tokens):
+        """Test boolean flags (-f, --basic_diff, ...) and string booleans (--compute_nbrows true)."""
+        params = MigrationParams(**_minimal_params(**{param: value}))
         command = command_builder.build_command(params)
 
-        idx = command.index("--compute_nbrows")
-        assert command[idx + 1] == "true"
-        idx = command.index("--drop_tables_if_exists")
-        assert command[idx + 1] == "false"
-
-    def test_boolean_flags(self, command_builder):
-        """Test boolean flags: -f, --basic_diff, --without_xid, --no_banner, --no_progress, --quiet_ft."""
-        params = MigrationParams(
-            **_minimal_params(
-                force=True,
-                basic_diff=True,
-                without_xid=True,
-                no_banner=True,
-                no_progress=True,
-                quiet_ft=True,
-            )
-        )
-        command = command_builder.build_command(params)
-
-        assert "-f" in command
-        assert "--basic_diff" in command
-        assert "--without_xid" in command
-        assert "--no_banner" in command
-        assert "--no_progress" in command
-        assert "--quiet_ft" in command
+        idx = command.index(tokens[0])
+        assert command[idx : idx + len(tokens)] == tokens
 
     def test_all_params_integration(self, command_builder):
         """Test building command with all optional parameters."""
@@ -245,62 +321,93 @@ class TestCommandBuilder:
         )
         command = command_builder.build_command(params)
 
-        assert "--source_schema_name" in command
-        assert "--target_schema_name" in command
-        assert "--task_list" in command
-        assert "-r" in command
-        assert "--fasttransfer_dir_path" in command
-        assert "-p" in command
-        assert "--ft_large_table_th" in command
-        assert "--n_jobs" in command
-        assert "--cci_threshold" in command
-        assert "--aci_threshold" in command
-        assert "--migration_db_mode" in command
-        assert "--compute_nbrows" in command
-        assert "--drop_tables_if_exists" in command
-        assert "--load_mode" in command
-        assert "-i" in command
-        assert "-e" in command
-        assert "-min" in command
-        assert "-max" in command
-        assert "--forced_int_id_prefixes" in command
-        assert "--forced_int_id_suffixes" in command
-        assert "--profiling_sample_pc" in command
-        assert "--p_query" in command
-        assert "--min_sample_pc_profile" in command
-        assert "-f" in command
-        assert "--basic_diff" in command
-        assert "--without_xid" in command
-        assert "--fk_mode" in command
-        assert "--log_level" in command
-        assert "--log_dir" in command
-        assert "--no_banner" in command
-        assert "--no_progress" in command
-        assert "--quiet_ft" in command
-        assert "--license" in command
+        expected_flags = {
+            "--source_schema_name",
+            "--target_schema_name",
+            "--task_list",
+            "-r",
+            "--fasttransfer_dir_path",
+            "-p",
+            "--ft_large_table_th",
+            "--n_jobs",
+            "--cci_threshold",
+            "--aci_threshold",
+            "--migration_db_mode",
+            "--compute_nbrows",
+            "--drop_tables_if_exists",
+            "--load_mode",
+            "-i",
+            "-e",
+            "-min",
+            "-max",
+            "--forced_int_id_prefixes",
+            "--forced_int_id_suffixes",
+            "--profiling_sample_pc",
+            "--p_query",
+            "--min_sample_pc_profile",
+            "-f",
+            "--basic_diff",
+            "--without_xid",
+            "--fk_mode",
+            "--log_level",
+            "--log_dir",
+            "--no_banner",
+            "--no_progress",
+            "--quiet_ft",
+            "--license",
+        }
+        positions = _flag_positions(command)
+        assert expected_flags <= positions.keys()
+        # Each flag is emitted exactly once
+        assert len(positions) == sum(tok.startswith("-") for tok in command)
+        idx = positions["--task_list"]
+        assert command[idx + 1 : idx + 3] == ["translate", "create"]
+
+    def test_build_command_rejects_min_rows_above_max_rows(self, command_builder):
+        """Test that min_rows > max_rows is rejected before building."""
+        params = MigrationParams(**_minimal_params(min_rows=100, max_rows=10))
+        with pytest.raises(MigratorXpressError, match=r"min_rows"):
+            command_builder.build_command(params)
+
+    def test_build_command_rejects_unsupported_fasttransfer(
+        self, mutable_command_builder
+    ):
+        """Test that FastTransfer options are rejected when unsupported."""
+        detector = mutable_command_builder.version_detector
+        detector.capabilities = replace(
+            detector.capabilities, supports_fasttransfer=False
+        )
+        params = MigrationParams(**_minimal_params(fasttransfer_dir_path="/opt/ft"))
+        with pytest.raises(MigratorXpressError, match=r"FastTransfer"):
+            mutable_command_builder.build_command(params)
+
+    def test_build_command_rejects_unsupported_license(self, mutable_command_builder):
+        """Test that license options are rejected when unsupported."""
+        detector = mutable_command_builder.version_detector
+        detector.capabilities = replace(detector.capabilities, supports_license=False)
+        params = MigrationParams(**_minimal_params(license_file="/path/lic"))
+        with pytest.raises(MigratorXpressError, match=r"--license"):
+            mutable_command_builder.build_command(params)
 
     def test_mask_sensitive_license(self, command_builder):
-        """Test that mask_sensitive masks the license value."""
+        """Test mask_sensitive masks the license and leaves the original as-is."""
         params = MigrationParams(**_minimal_params(license="SECRET-KEY-123"))
         command = command_builder.build_command(params)
+        original_command = list(command)
         masked = command_builder.mask_sensitive(command)
 
-        # Original should have the real value
-        idx = command.index("--license")
-        assert command[idx + 1] == "SECRET-KEY-123"
-
         # Masked should have ******
         idx = masked.index("--license")
         assert masked[idx + 1] == "******"
 
-    def test_mask_sensitive_preserves_original(self, command_builder):
-        """Test that mask_sensitive does not modify the original command."""
-        params = MigrationParams(**_minimal_params(license="SECRET-KEY-123"))
-        command = command_builder.build_command(params)
-        original_command = list(command)
-        command_builder.mask_sensitive(command)
-
+        # Original should be untouched and keep the real value
         assert command == original_command
+        assert command[idx + 1] == "SECRET-KEY-123"
+
+    def test_mask_sensitive_trailing_license_flag(self, command_builder):
+        """Test that a trailing --license with no value is left as-is."""
+        masked = command_builder.mask_sensitive(["bin", "-a", "auth.json", "--license"])
+        assert masked == ["bin", "-a", "auth.json", "--license"]
 
     def test_format_command_display_masked(self, command_builder):
         """Test format_command_display with masking (default)."""
@@ -328,14 +435,11 @@ class TestCommandBuilder:
 
         assert " \\\n  " in display
 
-    @patch("subprocess.run")
-    def test_execute_command_success(self, mock_run, command_builder):
+    def test_execute_command_success(self, mock_popen, command_builder):
         """Test successful command execution."""
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "Migration completed successfully"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+        mock_popen.return_value = _mock_process(
+            0, stdout="Migration completed successfully\n"
+        )
 
         command = [str(command_builder.binary_path), "--help"]
         return_code, stdout, stderr = command_builder.execute_command(
@@ -344,16 +448,11 @@ class TestCommandBuilder:
 
         assert return_code == 0
         assert "success" in stdout.lower()
-        mock_run.assert_called_once()
+        mock_popen.assert_called_once()
 
-    @patch("subprocess.run")
-    def test_execute_command_failure(self, mock_run, command_builder):
+    def test_execute_command_failure(self, mock_popen, command_builder):
         """Test failed command execution."""
-        mock_result = Mock()
-        mock_result.returncode = 1
-        mock_result.stdout = ""
-        mock_result.stderr = "Connection failed"
-        mock_run.return_value = mock_result
+        mock_popen.return_value = _mock_process(1, stderr="Connection failed\n")
 
         command = [str(command_builder.binary_path), "--help"]
         return_code, stdout, stderr = command_builder.execute_command(
@@ -363,25 +462,63 @@ class TestCommandBuilder:
         assert return_code == 1
         assert "failed" in stderr.lower()
 
-    @patch("subprocess.run")
-    def test_execute_command_timeout(self, mock_run, command_builder):
-        """Test command execution timeout."""
-        mock_run.side_effect = subprocess.TimeoutExpired(cmd="test", timeout=1)
+    @patch("src.migratorxpress._NEW_SESSION", True)
+    @patch("src.migratorxpress.os.killpg", create=True)
+    def test_execute_command_timeout(self, mock_killpg, mock_popen, command_builder):
+        """Test command execution timeout kills the process group."""
+        process = _mock_process(0)
+        process.pid = 4242
+        process.wait.side_effect = [
+            subprocess.TimeoutExpired(cmd="test", timeout=1),
+            -9,
+        ]
+        mock_popen.return_value = process
 
         command = [str(command_builder.binary_path), "--help"]
-        with pytest.raises(MigratorXpressError) as exc_info:
+        with pytest.raises(MigratorXpressError, match=r"(?i)timed out"):
             command_builder.execute_command(command, timeout=1)
 
-        assert "timed out" in str(exc_info.value).lower()
-
-    @patch("subprocess.run")
-    def test_execute_command_with_logging(self, mock_run, command_builder, tmp_path):
+        assert mock_popen.call_args.kwargs["start_new_session"] is True
+        mock_killpg.assert_called_once_with(4242, signal.SIGKILL)
+        process.kill.assert_not_called()
+
+    @pytest.mark.skipif(os.name != "posix", reason="needs a POSIX shell")
+    def test_execute_command_timeout_kills_grandchildren(
+        self, command_builder, tmp_path
+    ):
+        """Test a timeout returns promptly when a grandchild holds the pipes."""
+        script = tmp_path / "wrapper.sh"
+        script.write_text("#!/bin/sh\nsleep 30 &\nsleep 30\n")
+        script.chmod(0o755)
+
+        start = time.monotonic()
+        with pytest.raises(MigratorXpressError, match=r"(?i)timed out"):
+            command_builder.execute_command([str(script)], timeout=1)
+
+        assert time.monotonic() - start < 5
+
+    @pytest.mark.skipif(shutil.which("setsid") is None, reason="needs setsid")
+    @patch("src.migratorxpress._READER_JOIN_TIMEOUT", 0.2)
+    def test_execute_command_timeout_bounds_reader_wait(
+        self, command_builder, tmp_path
+    ):
+        """Test a timeout still returns when a descendant escapes the kill."""
+        script = tmp_path / "wrapper.sh"
+        # The grandchild starts its own session, so killing the group misses it
+        script.write_text("#!/bin/sh\nsetsid sleep 5 &\nsleep 30\n")
+        script.chmod(0o755)
+
+        start = time.monotonic()
+        with pytest.raises(MigratorXpressError, match=r"(?i)timed out"):
+            command_builder.execute_command([str(script)], timeout=1)
+
+        assert time.monotonic() - start < 4
+
+    def test_execute_command_with_logging(self, mock_popen, command_builder, tmp_path):
         """Test command execution with log saving."""
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "Success"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+        mock_popen.return_value = _mock_process(
+            0, stdout="Success\n", stderr="a warning\n"
+        )
 
         log_dir = tmp_path / "logs"
         command = [str(command_builder.binary_path), "--help"]
@@ -394,6 +531,71 @@ class TestCommandBuilder:
         log_content = log_files[0].read_text()
         assert "MigratorXpress Execution Log" in log_content
         assert "Return Code: 0" in log_content
+        assert "Success\n" in log_content
+        assert "[stderr] a warning\n" in log_content
+
+    def test_execute_command_log_masks_license(
+        self, mock_popen, command_builder, tmp_path
+    ):
+        """Test the execution log never contains the license value."""
+        mock_popen.return_value = _mock_process(0)
+
+        log_dir = tmp_path / "logs"
+        command = [str(command_builder.binary_path), "--license", "SECRET-KEY-123"]
+        command_builder.execute_command(command, timeout=10, log_dir=log_dir)
+
+        # The real value is still passed to the subprocess
+        assert mock_popen.call_args[0][0] == command
+        log_content = next(log_dir.glob("migratorxpress_*.log")).read_text()
+        assert "SECRET-KEY-123" not in log_content
+        assert "--license '******'" in log_content
+
+    @patch("src.migratorxpress._OUTPUT_TAIL_LINES", 2)
+    def test_execute_command_returns_bounded_tail(
+        self, mock_popen, command_builder, tmp_path
+    ):
+        """Test only the output tail is returned while the log gets everything."""
+        mock_popen.return_value = _mock_process(0, stdout="line1\nline2\nline3\n")
+
+        log_dir = tmp_path / "logs"
+        command = [str(command_builder.binary_path), "--help"]
+        _, stdout, _ = command_builder.execute_command(
+            command, timeout=10, log_dir=log_dir
+        )
+
+        assert stdout == "line2\nline3\n"
+        log_content = next(log_dir.glob("migratorxpress_*.log")).read_text()
+        assert "line1\nline2\nline3\n" in log_content
+
+    def test_execute_command_without_capture(self, mock_popen, command_builder):
+        """Test capture=False discards output to /dev/null when not logging."""
+        process = _mock_process(0)
+        mock_popen.return_value = process
+
+        command = [str(command_builder.binary_path), "--help"]
+        return_code, stdout, stderr = command_builder.execute_command(
+            command, timeout=10, capture=False
+        )
+
+        assert (return_code, stdout, stderr) == (0, "", "")
+        assert mock_popen.call_args.kwargs["stdout"] is subprocess.DEVNULL
+        assert mock_popen.call_args.kwargs["stderr"] is subprocess.DEVNULL
+
+    def test_execute_command_without_capture_still_logs(
+        self, mock_popen, command_builder, tmp_path
+    ):
+        """Test capture=False still streams output into the execution log."""
+        mock_popen.return_value = _mock_process(0, stdout="Success\n")
+
+        log_dir = tmp_path / "logs"
+        command = [str(command_builder.binary_path), "--help"]
+        _, stdout, _ = command_builder.execute_command(
+            command, timeout=10, log_dir=log_dir, capture=False
+        )
+
+        assert stdout == ""
+        log_content = next(log_dir.glob("migratorxpress_*.log")).read_text()
+        assert "Success\n" in log_content
 
     def test_get_version_method(self, command_builder):
         """Test get_version returns structured info."""
@@ -414,10 +616,41 @@ class TestCommandBuilder:
         assert "supports_fasttransfer" in info["capabilities"]
         assert "supports_license" in info["capabilities"]
 
+    def test_get_version_capabilities_sorted_once(self, command_builder):
+        """Test capability lists are sorted and reused across calls."""
+        caps1 = command_builder.get_version()["capabilities"]
+        caps2 = command_builder.get_version()["capabilities"]
+
+        assert caps1 is caps2
+        assert caps1["tasks"] == tuple(sorted(caps1["tasks"]))
+        assert caps1["load_modes"] == ("append", "truncate")
+
     def test_version_detector_property(self, command_builder):
         """Test version_detector property is accessible."""
         assert command_builder.version_detector is not None
 
+    def test_get_version_uses_cached_detection(self, mutable_command_builder):
+        """Test get_version does not re-run version detection."""
+        detector = mutable_command_builder.version_detector
+        detector.detect.reset_mock()
+
+        info1 = mutable_command_builder.get_version()
+        info2 = mutable_command_builder.get_version()
+
+        assert info1["version"] == info2["version"] == "0.6.24"
+        detector.detect.assert_not_called()
+
+    def test_refresh_version(self, mutable_command_builder):
+        """Test refresh_version re-runs detection with a fresh detector."""
+        with patch("src.migratorxpress.VersionDetector") as MockDetector:
+            MockDetector.return_value.detect.return_value = MigratorXpressVersion(
+                0, 7, 0
+            )
+            version = mutable_command_builder.refresh_version()
+
+        assert version == MigratorXpressVersion(0, 7, 0)
+        assert mutable_command_builder.get_version()["version"] == "0.7.0"
+
 
 class TestHelperFunctions:
     """Tests for helper functions."""
@@ -426,22 +659,25 @@ class TestHelperFunctions:
         """Test getting supported capabilities."""
         caps = get_supported_capabilities()
 
-        assert isinstance(caps, dict)
-        assert "Source Databases" in caps
-        assert "Target Databases" in caps
-        assert "Migration Database" in caps
-        assert "Tasks" in caps
-        assert "Migration DB Modes" in caps
-        assert "Load Modes" in caps
-        assert "FK Modes" in caps
-
-        assert len(caps["Source Databases"]) == 4
-        assert len(caps["Target Databases"]) == 2
-        assert len(caps["Migration Database"]) == 1
-        assert len(caps["Tasks"]) == 8
-        assert len(caps["Migration DB Modes"]) == 3
-        assert len(caps["Load Modes"]) == 2
-        assert len(caps["FK Modes"]) == 3
+        assert isinstance(caps, Mapping)
+        expected_sizes = {
+            "Source Databases": 4,
+            "Target Databases": 2,
+            "Migration Database": 1,
+            "Tasks": 8,
+            "Migration DB Modes": 3,
+            "Load Modes": 2,
+            "FK Modes": 3,
+        }
+        assert {key: len(values) for key, values in caps.items()} == expected_sizes
+
+    def test_get_supported_capabilities_is_shared_and_read_only(self):
+        """Test the capabilities payload is built once and cannot be mutated."""
+        caps = get_supported_capabilities()
+
+        assert get_supported_capabilities() is caps
+        with pytest.raises(TypeError):
+            caps["Tasks"]["new_task"] = "description"
 
     def test_suggest_workflow_with_constraints(self):
         """Test workflow suggestion with constraints."""
@@ -475,6 +711,15 @@ class TestHelperFunctions:
         assert "copy_pk + copy_ak + copy_fk" not in tasks
         assert "all" in tasks
 
+    def test_suggest_workflow_is_memoized(self):
+        """Test repeated calls with the same arguments share one result."""
+        first = suggest_workflow("oracle", "postgresql", include_constraints=True)
+        second = suggest_workflow("oracle", "postgresql", include_constraints=True)
+
+        assert first is second
+        with pytest.raises(TypeError):
+            first["steps"] = []
+
     def test_suggest_workflow_steps_have_examples(self):
         """Test that workflow steps contain examples."""
         workflow = suggest_workflow("oracle", "sqlserver")
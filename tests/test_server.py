@@ -0,0 +1,158 @@
+"""Tests for MCP server tool handlers."""
+
+import asyncio
+from collections import OrderedDict
+import logging
+import re
+from unittest.mock import patch
+
+import pytest
+from mcp import types
+
+from src import server
+from src.migratorxpress import CommandBuilder
+
+
+def _call_tool_request(name, arguments):
+    """Send a tools/call request through the SDK's registered handler."""
+    request = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(name=name, arguments=arguments),
+    )
+    handler = server.app.request_handlers[types.CallToolRequest]
+    return asyncio.run(handler(request)).root
+
+
+# Required preview_command arguments
+_MINIMAL_ARGS = {
+    "auth_file": "auth.json",
+    "source_db_auth_id": "source_db",
+    "source_db_name": "mydb",
+    "target_db_auth_id": "target_db",
+    "target_db_name": "targetdb",
+    "migration_db_auth_id": "migration_db",
+}
+
+_PREVIEW_ID_RE = re.compile(r"preview_id: ([0-9a-f]{12})")
+
+
+@pytest.fixture
+def builder(tmp_path, monkeypatch):
+    """Install a CommandBuilder for a fake binary and an empty preview cache."""
+    binary = tmp_path / "MigratorXpress"
+    binary.write_text("#!/bin/bash\necho 'mock binary'")
+    binary.chmod(0o755)
+    command_builder = CommandBuilder(str(binary), version_hint="0.6.24")
+    monkeypatch.setattr(server, "command_builder", command_builder)
+    monkeypatch.setattr(server, "_builder_initialized", True)
+    monkeypatch.setattr(server, "_PREVIEWS", OrderedDict())
+    return command_builder
+
+
+@pytest.fixture
+def mock_execute():
+    """Patch CommandBuilder.execute_command with a successful run."""
+    with patch.object(
+        CommandBuilder, "execute_command", return_value=(0, "done\n", "")
+    ) as execute:
+        yield execute
+
+
+def _preview(**overrides):
+    """Run preview_command and return its preview ID."""
+    result = asyncio.run(server.handle_preview_command({**_MINIMAL_ARGS, **overrides}))
+    return _PREVIEW_ID_RE.search(result[0].text).group(1)
+
+
+def _execute(**arguments):
+    """Run execute_command with confirmation and return the response text."""
+    result = asyncio.run(
+        server.handle_execute_command({"confirmation": True, **arguments})
+    )
+    return result[0].text
+
+
+class TestCallTool:
+    """Tests for the call_tool dispatcher."""
+
+    def test_invalid_argument_type_is_tool_error(self):
+        """Test a schema violation comes back as a CallToolResult error."""
+        result = _call_tool_request("preview_command", {"auth_file": 5})
+
+        assert result.isError is True
+        assert result.content[0].text.startswith("Input validation error:")
+
+
+class TestBackgroundTasks:
+    """Tests for fire-and-forget task bookkeeping."""
+
+    def test_failed_task_is_logged_and_released(self, caplog):
+        """Test a failing background task is logged and no longer referenced."""
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        async def run():
+            task = asyncio.create_task(fail(), name="init")
+            server._background_tasks.add(task)
+            task.add_done_callback(server._on_background_task_done)
+            await asyncio.wait([task])
+            return task
+
+        with caplog.at_level(logging.ERROR, logger=server.logger.name):
+            task = asyncio.run(run())
+
+        assert task not in server._background_tasks
+        assert "Background task init failed" in caplog.text
+        assert "boom" in caplog.text
+
+
+class TestPreviewExecution:
+    """Tests for running previewed commands through execute_command."""
+
+    def test_preview_id_runs_previewed_command_once(self, builder, mock_execute):
+        """Test a preview ID runs the exact previewed argv, and only once."""
+        preview_id = _preview(license="SECRET KEY")
+        expected = server._PREVIEWS[preview_id]
+
+        assert "Completed" in _execute(preview_id=preview_id)
+        assert mock_execute.call_args.args[0] == expected
+
+        text = _execute(preview_id=preview_id)
+        assert "already executed" in text
+        assert mock_execute.call_count == 1
+
+    def test_oldest_preview_is_evicted(self, builder, mock_execute):
+        """Test only the most recent _MAX_PREVIEWS previews are kept."""
+        preview_ids = [_preview() for _ in range(server._MAX_PREVIEWS + 1)]
+
+        assert list(server._PREVIEWS) == preview_ids[1:]
+        assert "Unknown" in _execute(preview_id=preview_ids[0])
+        mock_execute.assert_not_called()
+
+        assert "Completed" in _execute(preview_id=preview_ids[1])
+        mock_execute.assert_called_once()
+
+    def test_unknown_preview_id_is_rejected(self, builder, mock_execute):
+        """Test an unknown preview ID is rejected without running anything."""
+        text = _execute(preview_id="0123456789ab")
+
+        assert "Unknown or already executed preview_id" in text
+        mock_execute.assert_not_called()
+
+    def test_list_command_is_not_split(self, builder, mock_execute):
+        """Test a list command is run as given, without shlex.split."""
+        command = [str(builder.binary_path), "--license", "SECRET KEY"]
+
+        with patch("src.server.shlex.split") as split:
+            _execute(command=command)
+
+        split.assert_not_called()
+        assert mock_execute.call_args.args[0] == command
+
+    def test_string_command_is_split(self, builder, mock_execute):
+        """Test a string command is split with shell quoting rules."""
+        binary = str(builder.binary_path)
+        _execute(command=f"{binary} --license 'SECRET KEY'")
+
+        assert mock_execute.call_args.args[0] == [binary, "--license", "SECRET KEY"]
@@ -1,5 +1,8 @@
 """Tests for validators module."""
 
+from types import MappingProxyType
+from typing import get_args
+
 import pytest
 from pydantic import ValidationError
 
@@ -15,89 +18,73 @@ from src.validators import (
 )
 
 
-class TestTaskType:
-    """Tests for TaskType enum."""
-
-    def test_all_8_task_types(self):
-        """Test that there are exactly 8 task types."""
-        assert len(TaskType) == 8
-
-    def test_task_types_exist(self):
-        """Test all task type values exist."""
-        assert TaskType("translate") == TaskType.TRANSLATE
-        assert TaskType("create") == TaskType.CREATE
-        assert TaskType("transfer") == TaskType.TRANSFER
-        assert TaskType("diff") == TaskType.DIFF
-        assert TaskType("copy_pk") == TaskType.COPY_PK
-        assert TaskType("copy_ak") == TaskType.COPY_AK
-        assert TaskType("copy_fk") == TaskType.COPY_FK
-        assert TaskType("all") == TaskType.ALL
+# Every enum and its complete set of values
+_ENUM_VALUES = [
+    (
+        TaskType,
+        {
+            "translate",
+            "create",
+            "transfer",
+            "diff",
+            "copy_pk",
+            "copy_ak",
+            "copy_fk",
+            "all",
+        },
+    ),
+    (SourceDatabaseType, {"oracle", "postgresql", "sqlserver", "netezza"}),
+    (TargetDatabaseType, {"postgresql", "sqlserver"}),
+    (MigrationDbMode, {"preserve", "truncate", "drop"}),
+    (LoadMode, {"truncate", "append"}),
+    (FkMode, {"trusted", "untrusted", "disabled"}),
+    (LogLevel, {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}),
+]
+
+
+class TestEnums:
+    """Tests for enum types."""
+
+    @pytest.mark.parametrize(
+        "enum_cls, values",
+        _ENUM_VALUES,
+        ids=[enum_cls.__name__ for enum_cls, _ in _ENUM_VALUES],
+    )
+    def test_enum_values(self, enum_cls, values):
+        """Test each enum has exactly the expected values and looks them up."""
+        assert {member.value for member in enum_cls} == values
+        for value in values:
+            assert enum_cls(value).value == value
 
     def test_invalid_task_type(self):
         """Test that invalid task type raises ValueError."""
         with pytest.raises(ValueError):
             TaskType("invalid")
 
-
-class TestSourceDatabaseType:
-    """Tests for SourceDatabaseType enum."""
-
-    def test_all_4_source_types(self):
-        """Test that there are exactly 4 source database types."""
-        assert len(SourceDatabaseType) == 4
-
-    def test_source_types_exist(self):
-        """Test all source database types exist."""
-        assert SourceDatabaseType("oracle") == SourceDatabaseType.ORACLE
-        assert SourceDatabaseType("postgresql") == SourceDatabaseType.POSTGRESQL
-        assert SourceDatabaseType("sqlserver") == SourceDatabaseType.SQLSERVER
-        assert SourceDatabaseType("netezza") == SourceDatabaseType.NETEZZA
-
-
-class TestTargetDatabaseType:
-    """Tests for TargetDatabaseType enum."""
-
-    def test_all_2_target_types(self):
-        """Test that there are exactly 2 target database types."""
-        assert len(TargetDatabaseType) == 2
-
-    def test_target_types_exist(self):
-        """Test all target database types exist."""
-        assert TargetDatabaseType("postgresql") == TargetDatabaseType.POSTGRESQL
-        assert TargetDatabaseType("sqlserver") == TargetDatabaseType.SQLSERVER
-
-
-class TestOtherEnums:
-    """Tests for other enum types."""
-
-    def test_all_3_migration_db_modes(self):
-        """Test all 3 migration DB mode values exist."""
-        assert len(MigrationDbMode) == 3
-        assert MigrationDbMode("preserve") == MigrationDbMode.PRESERVE
-        assert MigrationDbMode("truncate") == MigrationDbMode.TRUNCATE
-        assert MigrationDbMode("drop") == MigrationDbMode.DROP
-
-    def test_all_2_load_modes(self):
-        """Test all 2 load mode values exist."""
-        assert len(LoadMode) == 2
-        assert LoadMode("truncate") == LoadMode.TRUNCATE
-        assert LoadMode("append") == LoadMode.APPEND
-
-    def test_all_3_fk_modes(self):
-        """Test all 3 FK mode values exist."""
-        assert len(FkMode) == 3
-        assert FkMode("trusted") == FkMode.TRUSTED
-        assert FkMode("untrusted") == FkMode.UNTRUSTED
-        assert FkMode("disabled") == FkMode.DISABLED
-
-    def test_all_5_log_levels(self):
-        """Test all 5 log level values exist."""
-        assert len(LogLevel) == 5
-        assert LogLevel("DEBUG") == LogLevel.DEBUG
-        assert LogLevel("INFO") == LogLevel.INFO
-        assert LogLevel("WARNING") == LogLevel.WARNING
-        assert LogLevel("ERROR") == LogLevel.ERROR
-        assert LogLevel("CRITICAL") == LogLevel.CRITICAL
+    def test_literal_fields_match_enums(self):
+        """Test MigrationParams literal fields accept exactly the enum values."""
+        fields = MigrationParams.model_fields
+        for field_name, enum_cls in (
+            ("migration_db_mode", MigrationDbMode),
+            ("load_mode", LoadMode),
+            ("fk_mode", FkMode),
+            ("log_level", LogLevel),
+        ):
+            literal, _ = get_args(fields[field_name].annotation)
+            assert set(get_args(literal)) == {m.value for m in enum_cls}
+
+
+# The six required params, shared read-only by every test
+_MINIMAL_BASE = MappingProxyType(
+    {
+        "auth_file": "auth.json",
+        "source_db_auth_id": "source_db",
+        "source_db_name": "mydb",
+        "target_db_auth_id": "target_db",
+        "target_db_name": "targetdb",
+        "migration_db_auth_id": "migration_db",
+    }
+)
 
 
 class TestMigrationParams:
@@ -105,16 +92,7 @@ class TestMigrationParams:
 
     def _minimal_params(self, **overrides):
         """Helper to create minimal valid params."""
-        base = {
-            "auth_file": "auth.json",
-            "source_db_auth_id": "source_db",
-            "source_db_name": "mydb",
-            "target_db_auth_id": "target_db",
-            "target_db_name": "targetdb",
-            "migration_db_auth_id": "migration_db",
-        }
-        base.update(overrides)
-        return base
+        return {**_MINIMAL_BASE, **overrides}
 
     def test_valid_minimal(self):
         """Test valid minimal parameters (6 required fields only)."""
@@ -126,93 +104,62 @@ class TestMigrationParams:
         assert params.target_db_name == "targetdb"
         assert params.migration_db_auth_id == "migration_db"
 
-    def test_auth_file_required(self):
-        """Test that auth_file is required."""
-        with pytest.raises(ValidationError):
-            MigrationParams(
-                source_db_auth_id="src",
-                source_db_name="db",
-                target_db_auth_id="tgt",
-                target_db_name="db",
-                migration_db_auth_id="mig",
-            )
-
-    def test_source_db_auth_id_required(self):
-        """Test that source_db_auth_id is required."""
-        with pytest.raises(ValidationError):
-            MigrationParams(
-                auth_file="auth.json",
-                source_db_name="db",
-                target_db_auth_id="tgt",
-                target_db_name="db",
-                migration_db_auth_id="mig",
-            )
-
-    def test_target_db_auth_id_required(self):
-        """Test that target_db_auth_id is required."""
-        with pytest.raises(ValidationError):
-            MigrationParams(
-                auth_file="auth.json",
-                source_db_auth_id="src",
-                source_db_name="db",
-                target_db_name="db",
-                migration_db_auth_id="mig",
-            )
-
-    def test_migration_db_auth_id_required(self):
-        """Test that migration_db_auth_id is required."""
-        with pytest.raises(ValidationError):
-            MigrationParams(
-                auth_file="auth.json",
-                source_db_auth_id="src",
-                source_db_name="db",
-                target_db_auth_id="tgt",
-                target_db_name="db",
-            )
+    @pytest.mark.parametrize("missing", list(_MINIMAL_BASE))
+    def test_required_field(self, missing):
+        """Test that each of the six required fields is required."""
+        params = self._minimal_params()
+        del params[missing]
+        with pytest.raises(ValidationError) as exc_info:
+            MigrationParams(**params)
+        assert missing in str(exc_info.value)
 
     def test_valid_with_all_params(self):
         """Test valid parameters with all optional fields."""
-        params = MigrationParams(
-            **self._minimal_params(
-                source_schema_name="dbo",
-                target_schema_name="public",
-                task_list=["translate", "create", "transfer"],
-                resume="run-123",
-                fasttransfer_dir_path="/opt/fasttransfer",
-                fasttransfer_p=4,
-                ft_large_table_th=100000,
-                n_jobs=2,
-                cci_threshold=500000,
-                aci_threshold=100000,
-                migration_db_mode="truncate",
-                compute_nbrows="true",
-                drop_tables_if_exists="false",
-                load_mode="truncate",
-                include_tables="orders*",
-                exclude_tables="*_tmp",
-                min_rows=100,
-                max_rows=1000000,
-                forced_int_id_prefixes=["ID_", "PK_"],
-                forced_int_id_suffixes=["_ID", "_PK"],
-                profiling_sample_pc=0.1,
-                p_query=0.05,
-                min_sample_pc_profile=0.01,
-                force=True,
-                basic_diff=True,
-                without_xid=True,
-                fk_mode="trusted",
-                log_level="DEBUG",
-                log_dir="/tmp/logs",
-                no_banner=True,
-                no_progress=True,
-                quiet_ft=True,
-                license="ABC-123-DEF",
-            )
-        )
-        assert params.source_schema_name == "dbo"
-        assert params.n_jobs == 2
-        assert params.force is True
-        assert params.fk_mode == FkMode.TRUSTED
+        optional = {
+            "source_schema_name": "dbo",
+            "target_schema_name": "public",
+            "task_list": ["translate", "create", "transfer"],
+            "resume": "run-123",
+            "fasttransfer_dir_path": "/opt/fasttransfer",
+            "fasttransfer_p": 4,
+            "ft_large_table_th": 100000,
+            "n_jobs": 2,
+            "cci_threshold": 500000,
+            "aci_threshold": 100000,
+            "migration_db_mode": "truncate",
+            "compute_nbrows": "true",
+            "drop_tables_if_exists": "false",
+            "load_mode": "truncate",
+            "include_tables": "orders*",
+            "exclude_tables": "*_tmp",
+            "min_rows": 100,
+            "max_rows": 1000000,
+            "forced_int_id_prefixes": ["ID_", "PK_"],
+            "forced_int_id_suffixes": ["_ID", "_PK"],
+            "profiling_sample_pc": 0.1,
+            "p_query": 0.05,
+            "min_sample_pc_profile": 0.01,
+            "force": True,
+            "basic_diff": True,
+            "without_xid": True,
+            "fk_mode": "trusted",
+            "log_level": "DEBUG",
+            "log_dir": "/tmp/logs",
+            "no_banner": True,
+            "no_progress": True,
+            "quiet_ft": True,
+            "license": "ABC-123-DEF",
+        }
+        params = MigrationParams(**self._minimal_params(**optional))
+
+        # String booleans are the only values validation converts
+        expected = {
+            **_MINIMAL_BASE,
+            **optional,
+            "compute_nbrows": True,
+            "drop_tables_if_exists": False,
+        }
+        assert params.model_dump(exclude_defaults=True) == expected
 
     def test_task_list_valid(self):
         """Test valid task list."""
@@ -243,12 +190,23 @@ class TestMigrationParams:
     def test_string_boolean_valid_true(self):
         """Test valid string-boolean 'true'."""
         params = MigrationParams(**self._minimal_params(compute_nbrows="true"))
-        assert params.compute_nbrows == "true"
+        assert params.compute_nbrows is True
 
     def test_string_boolean_valid_false(self):
         """Test valid string-boolean 'false'."""
         params = MigrationParams(**self._minimal_params(drop_tables_if_exists="false"))
-        assert params.drop_tables_if_exists == "false"
+        assert params.drop_tables_if_exists is False
+
+    def test_params_are_frozen(self):
+        """Test MigrationParams cannot be mutated after validation."""
+        params = MigrationParams(**self._minimal_params())
+        with pytest.raises(ValidationError):
+            params.source_db_name = "other"
+
+    def test_string_boolean_accepts_bool(self):
+        """Test string-boolean params also accept real booleans."""
+        params = MigrationParams(**self._minimal_params(compute_nbrows=False))
+        assert params.compute_nbrows is False
 
     def test_string_boolean_invalid(self):
         """Test that invalid string-boolean raises error."""
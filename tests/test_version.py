@@ -1,52 +1,86 @@
 """Tests for version detection and capabilities registry."""
 
+import bisect
 import subprocess
-from unittest.mock import patch, Mock
+from types import SimpleNamespace
+from unittest.mock import call, patch
 
 import pytest
 
 from src.version import (
+    LATEST_CAPABILITIES,
     MigratorXpressVersion,
     VersionDetector,
     VERSION_REGISTRY,
+    _REGISTRY,
     check_version_compatibility,
 )
 
 
+# Every capability set of the 0.6.24 registry entry and its exact values
+_REGISTRY_0624_VALUES = [
+    ("source_databases", {"oracle", "postgresql", "sqlserver", "netezza"}),
+    ("target_databases", {"postgresql", "sqlserver"}),
+    ("migration_db_types", {"sqlserver"}),
+    (
+        "tasks",
+        {
+            "translate",
+            "create",
+            "transfer",
+            "diff",
+            "copy_pk",
+            "copy_ak",
+            "copy_fk",
+            "all",
+        },
+    ),
+    ("fk_modes", {"trusted", "untrusted", "disabled"}),
+    ("migration_db_modes", {"preserve", "truncate", "drop"}),
+    ("load_modes", {"truncate", "append"}),
+]
+
+
+@pytest.fixture
+def mock_run():
+    """Patch subprocess.run in src.version for one test and yield the mock."""
+    with patch("src.version.subprocess.run") as run:
+        yield run
+
+
+def _version_output(stdout):
+    """Create a fake subprocess.run result with the given stdout."""
+    return SimpleNamespace(stdout=stdout, stderr="", returncode=0)
+
+
 class TestMigratorXpressVersion:
     """Tests for MigratorXpressVersion dataclass."""
 
-    def test_parse_full_version_string(self):
-        """Test parsing a full 'migratorxpress X.Y.Z' string."""
-        v = MigratorXpressVersion.parse("migratorxpress 0.6.24")
-        assert v.major == 0
-        assert v.minor == 6
-        assert v.patch == 24
-
-    def test_parse_numeric_only(self):
-        """Test parsing a bare version number."""
-        v = MigratorXpressVersion.parse("0.6.24")
-        assert v == MigratorXpressVersion(0, 6, 24)
-
-    def test_parse_with_whitespace(self):
-        """Test parsing a version string with leading/trailing whitespace."""
-        v = MigratorXpressVersion.parse("  migratorxpress 1.2.3  ")
-        assert v == MigratorXpressVersion(1, 2, 3)
-
-    def test_parse_case_insensitive(self):
-        """Test parsing is case-insensitive for the prefix."""
-        v = MigratorXpressVersion.parse("MigratorXpress 0.6.24")
-        assert v == MigratorXpressVersion(0, 6, 24)
-
-    def test_parse_invalid_string(self):
+    @pytest.mark.parametrize(
+        "text,expected",
+        [
+            pytest.param("migratorxpress 0.6.24", (0, 6, 24), id="full"),
+            pytest.param("0.6.24", (0, 6, 24), id="numeric-only"),
+            pytest.param("  migratorxpress 1.2.3  ", (1, 2, 3), id="whitespace"),
+            pytest.param("MigratorXpress 0.6.24", (0, 6, 24), id="mixed-case"),
+        ],
+    )
+    def test_parse(self, text, expected):
+        """Test parsing version strings, with or without the binary name."""
+        v = MigratorXpressVersion.parse(text)
+        assert (v.major, v.minor, v.patch) == expected
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            pytest.param("no version here", id="no-version"),
+            pytest.param("0.6", id="incomplete"),
+        ],
+    )
+    def test_parse_invalid(self, text):
         """Test that an unparseable string raises ValueError."""
         with pytest.raises(ValueError, match="Cannot parse version"):
-            MigratorXpressVersion.parse("no version here")
-
-    def test_parse_incomplete_version(self):
-        """Test that an incomplete version string raises ValueError."""
-        with pytest.raises(ValueError, match="Cannot parse version"):
-            MigratorXpressVersion.parse("0.6")
+            MigratorXpressVersion.parse(text)
 
     def test_str_representation(self):
         """Test string representation."""
@@ -72,7 +106,7 @@ class TestMigratorXpressVersion:
         assert a < b
 
     def test_greater_than(self):
-        """Test greater-than comparison (via total_ordering)."""
+        """Test greater-than comparison."""
         a = MigratorXpressVersion(0, 6, 24)
         b = MigratorXpressVersion(0, 6, 23)
         assert a > b
@@ -93,40 +127,34 @@ class TestMigratorXpressVersion:
 class TestVersionDetector:
     """Tests for VersionDetector class."""
 
-    @patch("src.version.subprocess.run")
     def test_detect_success(self, mock_run):
         """Test successful version detection."""
-        mock_result = Mock()
-        mock_result.stdout = "migratorxpress 0.6.24\n"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+        mock_run.return_value = _version_output("migratorxpress 0.6.24\n")
 
         detector = VersionDetector("/fake/binary")
         version = detector.detect()
 
         assert version == MigratorXpressVersion(0, 6, 24)
-        mock_run.assert_called_once_with(
-            ["/fake/binary", "--version", "--no_banner"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-            check=False,
-        )
+        assert mock_run.call_args_list == [
+            call(
+                ["/fake/binary", "--version", "--no_banner"],
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True,
+                timeout=10,
+                check=False,
+            )
+        ]
 
-    @patch("src.version.subprocess.run")
     def test_detect_failure_no_match(self, mock_run):
         """Test detection when output doesn't match version pattern."""
-        mock_result = Mock()
-        mock_result.stdout = "Unknown output"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+        mock_run.return_value = _version_output("Unknown output")
 
         detector = VersionDetector("/fake/binary")
         version = detector.detect()
 
         assert version is None
 
-    @patch("src.version.subprocess.run")
     def test_detect_timeout(self, mock_run):
         """Test detection handles timeout gracefully."""
         mock_run.side_effect = subprocess.TimeoutExpired(cmd="test", timeout=10)
@@ -136,7 +164,6 @@ class TestVersionDetector:
 
         assert version is None
 
-    @patch("src.version.subprocess.run")
     def test_detect_binary_not_found(self, mock_run):
         """Test detection handles missing binary gracefully."""
         mock_run.side_effect = FileNotFoundError("No such file")
@@ -146,13 +173,9 @@ class TestVersionDetector:
 
         assert version is None
 
-    @patch("src.version.subprocess.run")
     def test_detect_caching(self, mock_run):
         """Test that second call returns cached result without re-running subprocess."""
-        mock_result = Mock()
-        mock_result.stdout = "migratorxpress 0.6.24\n"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+        mock_run.return_value = _version_output("migratorxpress 0.6.24\n")
 
         detector = VersionDetector("/fake/binary")
         v1 = detector.detect()
@@ -161,13 +184,18 @@ class TestVersionDetector:
         assert v1 == v2
         assert mock_run.call_count == 1
 
-    @patch("src.version.subprocess.run")
+    def test_detect_with_known_version(self, mock_run):
+        """Test a known version is returned without running the binary."""
+        detector = VersionDetector(
+            "/fake/binary", known_version=MigratorXpressVersion(0, 6, 24)
+        )
+
+        assert detector.detect() == MigratorXpressVersion(0, 6, 24)
+        mock_run.assert_not_called()
+
     def test_capabilities_known_version(self, mock_run):
         """Test capabilities resolution for a known version."""
-        mock_result = Mock()
-        mock_result.stdout = "migratorxpress 0.6.24\n"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+        mock_run.return_value = _version_output("migratorxpress 0.6.24\n")
 
         detector = VersionDetector("/fake/binary")
         detector.detect()
@@ -183,22 +211,37 @@ class TestVersionDetector:
         assert caps.supports_fasttransfer is True
         assert caps.supports_license is True
 
-    @patch("src.version.subprocess.run")
     def test_capabilities_newer_unknown_version(self, mock_run):
         """Test capabilities falls back to latest known for newer unknown version."""
-        mock_result = Mock()
-        mock_result.stdout = "migratorxpress 1.0.0\n"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+        mock_run.return_value = _version_output("migratorxpress 1.0.0\n")
 
         detector = VersionDetector("/fake/binary")
         detector.detect()
         caps = detector.capabilities
 
         # Should get the latest known capabilities (0.6.24)
-        assert caps == VERSION_REGISTRY["0.6.24"]
+        assert caps is LATEST_CAPABILITIES
+
+    def test_capabilities_older_unknown_version(self):
+        """Test capabilities falls back to latest known for older unknown version."""
+        detector = VersionDetector(
+            "/fake/binary", known_version=MigratorXpressVersion(0, 1, 0)
+        )
+
+        # Older than every registry entry — fall back to latest known
+        assert detector.capabilities is LATEST_CAPABILITIES
+
+    @patch("src.version.bisect.bisect_right", wraps=bisect.bisect_right)
+    def test_capabilities_resolved_once(self, mock_bisect):
+        """Test repeated capabilities reads reuse the first registry lookup."""
+        detector = VersionDetector(
+            "/fake/binary", known_version=MigratorXpressVersion(0, 6, 24)
+        )
+
+        caps = detector.capabilities
+        assert detector.capabilities is caps
+        assert mock_bisect.call_count == 1
 
-    @patch("src.version.subprocess.run")
     def test_capabilities_undetected_version(self, mock_run):
         """Test capabilities falls back to latest known when detection fails."""
         mock_run.side_effect = FileNotFoundError("No such file")
@@ -208,65 +251,26 @@ class TestVersionDetector:
         caps = detector.capabilities
 
         # Should fall back to latest known
-        assert caps == VERSION_REGISTRY["0.6.24"]
-
-    def test_registry_0624_source_completeness(self):
-        """Test that 0.6.24 registry has all 4 expected source databases."""
-        caps = VERSION_REGISTRY["0.6.24"]
-        expected = {"oracle", "postgresql", "sqlserver", "netezza"}
-        assert caps.source_databases == expected
-        assert len(caps.source_databases) == 4
-
-    def test_registry_0624_target_completeness(self):
-        """Test that 0.6.24 registry has all 2 expected target databases."""
-        caps = VERSION_REGISTRY["0.6.24"]
-        expected = {"postgresql", "sqlserver"}
-        assert caps.target_databases == expected
-        assert len(caps.target_databases) == 2
-
-    def test_registry_0624_migration_db_completeness(self):
-        """Test that 0.6.24 registry has 1 migration database type."""
-        caps = VERSION_REGISTRY["0.6.24"]
-        expected = {"sqlserver"}
-        assert caps.migration_db_types == expected
-        assert len(caps.migration_db_types) == 1
-
-    def test_registry_0624_task_completeness(self):
-        """Test that 0.6.24 registry has all 8 tasks."""
-        caps = VERSION_REGISTRY["0.6.24"]
-        expected = {
-            "translate",
-            "create",
-            "transfer",
-            "diff",
-            "copy_pk",
-            "copy_ak",
-            "copy_fk",
-            "all",
-        }
-        assert caps.tasks == expected
-        assert len(caps.tasks) == 8
-
-    def test_registry_0624_fk_modes_completeness(self):
-        """Test that 0.6.24 registry has all 3 FK modes."""
-        caps = VERSION_REGISTRY["0.6.24"]
-        expected = {"trusted", "untrusted", "disabled"}
-        assert caps.fk_modes == expected
-        assert len(caps.fk_modes) == 3
-
-    def test_registry_0624_migration_db_modes_completeness(self):
-        """Test that 0.6.24 registry has all 3 migration DB modes."""
-        caps = VERSION_REGISTRY["0.6.24"]
-        expected = {"preserve", "truncate", "drop"}
-        assert caps.migration_db_modes == expected
-        assert len(caps.migration_db_modes) == 3
-
-    def test_registry_0624_load_modes_completeness(self):
-        """Test that 0.6.24 registry has all 2 load modes."""
-        caps = VERSION_REGISTRY["0.6.24"]
-        expected = {"truncate", "append"}
-        assert caps.load_modes == expected
-        assert len(caps.load_modes) == 2
+        assert caps is LATEST_CAPABILITIES
+
+    def test_registry_is_sorted(self):
+        """Test the registry is declared in ascending version order."""
+        versions = [ver for ver, _ in _REGISTRY]
+        assert versions == sorted(versions)
+
+    def test_latest_capabilities_is_newest_entry(self):
+        """Test LATEST_CAPABILITIES is the newest registry entry (0.6.24)."""
+        assert LATEST_CAPABILITIES is _REGISTRY[-1][1]
+        assert LATEST_CAPABILITIES is VERSION_REGISTRY["0.6.24"]
+
+    @pytest.mark.parametrize(
+        "attr,expected",
+        _REGISTRY_0624_VALUES,
+        ids=[attr for attr, _ in _REGISTRY_0624_VALUES],
+    )
+    def test_registry_0624_completeness(self, attr, expected):
+        """Test that the 0.6.24 registry entry has exactly the expected values."""
+        assert getattr(VERSION_REGISTRY["0.6.24"], attr) == expected
 
 
 class TestCheckVersionCompatibility: